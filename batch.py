@@ -0,0 +1,123 @@
+"""
+Vectorized SIRS / sepsis classification for many patients at once.
+
+Gives the same answers as classifier.classify(), but works on whole NumPy arrays or pandas DataFrames so a
+census of tens of thousands of patients can be screened without a Python loop.
+
+pandas is only imported by the functions that build DataFrames, so callers working with plain NumPy arrays don't pay
+for importing it.
+"""
+import numpy as np
+
+from classifier import INPUT_FIELDS, MODS, OUTCOMES, SEPSIS, SEPTIC_SHOCK, SEVERE_SEPSIS, SIRS, TIER_NAMES, is_met
+
+RESULT_COLUMNS = ("sirs_criteria_met", "tier", "tier_name")
+
+# classifier.OUTCOMES as arrays indexed by 8-bit input code, for classify_codes()
+SIRS_CRITERIA_MET_BY_CODE = np.array([outcome.sirs_criteria_met for outcome in OUTCOMES], dtype=np.int8)
+TIER_BY_CODE = np.array([outcome.tier for outcome in OUTCOMES], dtype=np.int8)
+
+
+def as_bool(values):
+    """
+    Convert a column of answers ("Yes"/"No" strings, bools, or 0/1) into a boolean NumPy array. Missing answers (NaN,
+    None, pd.NA) are not met, and strings other than "Yes" and "No" raise ValueError (see classifier.is_met()).
+    """
+    values = np.asarray(values)
+    kind = values.dtype.kind
+    if kind == "b":
+        return values
+    if kind == "f":
+        return (values != 0) & ~np.isnan(values)
+    if kind in "iuc":
+        return values != 0
+    if kind == "S":
+        values = values.astype(str)
+        kind = "U"
+    if kind in "OU":
+        # Columns of "Yes"/"No" strings are by far the most common, so try them as a whole first
+        try:
+            yes = values == "Yes"
+            if (yes | (values == "No")).all():
+                return yes
+        except TypeError: # Comparing pd.NA with a string can't give a bool
+            pass
+        return np.fromiter(map(is_met, values.ravel()), dtype=bool, count=values.size).reshape(values.shape)
+    raise ValueError(f"Can't read answers from an array of {values.dtype}")
+
+
+def classify_arrays(temperature, heart_rate, respiratory_rate, white_blood_cells,
+                    sepsis, severe_sepsis, septic_shock, multi_organ_failure):
+    """
+    Classify every patient in the given arrays (one element per patient, all the same length).
+    Returns (sirs_criteria_met, tier) as int8 arrays; tier uses the constants from classifier.py.
+    """
+    sirs_criteria_met = (as_bool(temperature).astype(np.int8) + as_bool(heart_rate)
+                         + as_bool(respiratory_rate) + as_bool(white_blood_cells))
+    has_sirs = sirs_criteria_met >= 2
+
+    # The tier constants are numbered in order of precedence (MODS > septic shock > severe sepsis > sepsis > SIRS),
+    # so the if/elif ladder in main() reduces to taking the highest tier whose criterion is met.
+    tier = np.maximum.reduce([
+        np.full(has_sirs.shape, SIRS, dtype=np.int8),
+        as_bool(sepsis) * np.int8(SEPSIS),
+        as_bool(severe_sepsis) * np.int8(SEVERE_SEPSIS),
+        as_bool(septic_shock) * np.int8(SEPTIC_SHOCK),
+        as_bool(multi_organ_failure) * np.int8(MODS),
+    ])
+    tier = tier * has_sirs # Nothing beyond "No SIRS" applies unless SIRS criteria are met
+    return sirs_criteria_met.astype(np.int8), tier.astype(np.int8)
+
+
+def pack_codes(temperature, heart_rate, respiratory_rate, white_blood_cells,
+               sepsis, severe_sepsis, septic_shock, multi_organ_failure):
+    """ Pack each patient's eight answers into an 8-bit input code (see classifier.PatientInputs.to_code())."""
+    columns = (temperature, heart_rate, respiratory_rate, white_blood_cells,
+               sepsis, severe_sepsis, septic_shock, multi_organ_failure)
+    codes = as_bool(columns[0]).astype(np.uint8)
+    for bit, column in enumerate(columns[1:], start=1):
+        codes |= as_bool(column).astype(np.uint8) << bit
+    return codes
+
+
+def classify_codes(codes):
+    """ Look up (sirs_criteria_met, tier) for an array of 8-bit input codes."""
+    codes = np.asarray(codes)
+    return SIRS_CRITERIA_MET_BY_CODE[codes], TIER_BY_CODE[codes]
+
+
+def outcome_table():
+    """ Every row of classifier.OUTCOMES as a DataFrame indexed by input code, e.g. to diff when the criteria change."""
+    import pandas as pd
+    rows = []
+    for code, outcome in enumerate(OUTCOMES):
+        answers = {name: "Yes" if code >> bit & 1 else "No" for bit, name in enumerate(INPUT_FIELDS)}
+        rows.append({**answers, "sirs_criteria_met": outcome.sirs_criteria_met, "tier": outcome.tier,
+                     "tier_name": outcome.tier_name, "banner": outcome.banner, "message": outcome.message})
+    return pd.DataFrame(rows).rename_axis("code")
+
+
+def classify_matrix(inputs):
+    """ Classify an (n, 8) array whose columns are in INPUT_FIELDS order. Returns (sirs_criteria_met, tier)."""
+    inputs = np.asarray(inputs)
+    if inputs.ndim != 2 or inputs.shape[1] != len(INPUT_FIELDS):
+        raise ValueError(f"Expected an (n, {len(INPUT_FIELDS)}) array, got shape {inputs.shape}")
+    return classify_arrays(*inputs.T)
+
+
+def classify_frame(df):
+    """
+    Classify every row of a DataFrame that has one column per question in INPUT_FIELDS.
+    Returns a DataFrame with the same index and the columns in RESULT_COLUMNS.
+    """
+    missing = [name for name in INPUT_FIELDS if name not in df.columns]
+    if missing:
+        raise ValueError(f"Missing input columns: {', '.join(missing)}")
+    import pandas as pd
+    sirs_criteria_met, tier = classify_arrays(*(df[name].to_numpy() for name in INPUT_FIELDS))
+    return pd.DataFrame({
+        "sirs_criteria_met": sirs_criteria_met,
+        "tier": tier,
+        "tier_name": pd.Categorical.from_codes(tier, categories=TIER_NAMES),
+    }, index=df.index)
+
@@ -0,0 +1,340 @@
+"""
+Benchmarks for the classifier, the batch and streaming paths, the Streamlit app's rerun time, the scoring service's
+latency and throughput, and import (cold start) time of each entry point.
+
+Results are printed (or written to --output) as JSON so runs from different releases can be compared.
+
+    python benchmark.py --output bench.json
+    python benchmark.py --quick            # smaller sizes, for a fast sanity check
+    python benchmark.py --cold-start-only  # just the import times; fails if any is over budget
+    python benchmark.py --service-only     # just the scoring service; fails if it misses its targets
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from batch import classify_arrays, classify_frame
+from classifier import INPUT_FIELDS, PatientInputs, classify, classify_code
+from score import score_file
+
+BATCH_SIZES = (1_000, 100_000, 10_000_000)
+QUICK_BATCH_SIZES = (1_000, 100_000)
+
+# Import-time budgets (ms, cumulative as reported by python -X importtime) for each entry point, and the modules it
+# imports. The headless ones must not import Streamlit, and classifier/incremental must not import NumPy either.
+# "main" is the UI module on its own, with Streamlit left unloaded until the UI runs; "ui" is what running the app pays.
+COLD_START_BUDGETS_MS = {
+    "classifier": 25,
+    "incremental": 25,
+    "main": 25,
+    "batch": 250,
+    "vitals": 250,
+    "service": 500,
+    "score": 1000,
+    "ui": 1500,
+}
+COLD_START_MODULES = {
+    "ui": ("streamlit", "main"),
+}
+
+# The scoring service's performance targets (see service.py): /score latency at SERVICE_RATE requests/sec, and
+# /score/batch throughput for batches of SERVICE_BATCH_SIZE patients
+SERVICE_RATE = 500
+SERVICE_BATCH_SIZE = 10_000
+SERVICE_TARGETS = {"p50_ms": 10, "p99_ms": 25, "batch_patients_per_s": 150_000}
+
+
+def _latency(func, number, repeat=7):
+    """ Time func() number times per run; returns the median and best per-call time over the runs, in nanoseconds."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        runs.append((time.perf_counter_ns() - start) / number)
+    return {"median_ns": statistics.median(runs), "min_ns": min(runs), "calls_per_run": number}
+
+
+def _random_answers(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.random((rows, len(INPUT_FIELDS))) < 0.3
+
+
+def bench_single(number):
+    """ Latency of classifying one patient."""
+    inputs = PatientInputs(True, True, False, False, True, False, False, False)
+    code = inputs.to_code()
+    answers = dict(temperature="Yes", heart_rate="Yes", respiratory_rate="No", white_blood_cells="No",
+                   sepsis="Yes", severe_sepsis="No", septic_shock="No", multi_organ_failure="No")
+    return {
+        "classify": _latency(lambda: classify(inputs), number),
+        "classify_code": _latency(lambda: classify_code(code), number),
+        "from_answers_and_classify": _latency(lambda: classify(PatientInputs.from_answers(**answers)), number),
+    }
+
+
+def bench_batch(sizes, repeat=5):
+    """ Throughput of the vectorized classifier on boolean arrays, and on DataFrames of "Yes"/"No" answers."""
+    results = {}
+    for rows in sizes:
+        columns = list(_random_answers(rows).T.copy())
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            classify_arrays(*columns)
+            times.append(time.perf_counter() - start)
+        result = {"rows": rows, "median_s": statistics.median(times), "rows_per_s": rows / statistics.median(times)}
+
+        if rows <= 1_000_000: # A DataFrame of strings is too big to be worth it beyond this
+            df = pd.DataFrame(np.where(np.column_stack(columns), "Yes", "No"), columns=INPUT_FIELDS)
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                classify_frame(df)
+                times.append(time.perf_counter() - start)
+            result["frame_median_s"] = statistics.median(times)
+            result["frame_rows_per_s"] = rows / statistics.median(times)
+        results[str(rows)] = result
+        del columns
+    return results
+
+
+def bench_streaming(rows, workers=1):
+    """ Throughput of score.py's score_file() on CSV and Parquet inputs of the given size."""
+    df = pd.DataFrame(np.where(_random_answers(rows), "Yes", "No"), columns=INPUT_FIELDS)
+    df.insert(0, "encounter_id", np.arange(rows))
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt in ("csv", "parquet"):
+            input_path = os.path.join(directory, f"input.{fmt}")
+            output_path = os.path.join(directory, f"output.{fmt}")
+            if fmt == "csv":
+                df.to_csv(input_path, index=False)
+            else:
+                df.to_parquet(input_path, index=False)
+            start = time.perf_counter()
+            score_file(input_path, output_path, workers=workers)
+            elapsed = time.perf_counter() - start
+            results[fmt] = {"rows": rows, "workers": workers, "seconds": elapsed, "rows_per_s": rows / elapsed}
+    return results
+
+
+def bench_streamlit_rerun(reruns):
+    """
+    Wall time of one rerun of main.py, driven headlessly with Streamlit's AppTest. Each rerun flips one answer, and
+    the "clicked" runs also press every info button so the educational text is rendered as well.
+    """
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError as e:
+        return {"skipped": f"streamlit.testing is not available: {e}"}
+
+    app = AppTest.from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py"), default_timeout=60)
+    app.run()
+    results = {}
+    for label, click_buttons in (("answers_only", False), ("all_buttons_clicked", True)):
+        times = []
+        for i in range(reruns):
+            if click_buttons:
+                for button in app.button:
+                    button.click()
+            radio = app.radio[i % len(INPUT_FIELDS)]
+            radio.set_value("No" if radio.value == "Yes" else "Yes")
+            start = time.perf_counter()
+            app.run()
+            times.append(time.perf_counter() - start)
+        if app.exception:
+            return {"error": [e.message for e in app.exception]}
+        results[label] = {"reruns": reruns, "median_ms": statistics.median(times) * 1000,
+                          "p90_ms": float(np.percentile(times, 90)) * 1000}
+    return results
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _drive_service(base_url, rate, seconds, batch_size, batches):
+    """ Send /score requests at a steady rate, then /score/batch requests one after another, and time them."""
+    from tornado.httpclient import AsyncHTTPClient, HTTPClientError
+
+    client = AsyncHTTPClient(force_instance=True, max_clients=10_000)
+    try:
+        # Wait for the service to start listening
+        for _ in range(300):
+            try:
+                await client.fetch(base_url + "/health")
+                break
+            except (ConnectionError, HTTPClientError):
+                await asyncio.sleep(0.1)
+
+        body = json.dumps({"temperature": "Yes", "heart_rate": "Yes", "sepsis": "Yes"})
+        latencies = []
+
+        async def score():
+            start = time.perf_counter()
+            await client.fetch(base_url + "/score", method="POST", body=body)
+            latencies.append(time.perf_counter() - start)
+
+        requests = []
+        start = time.perf_counter()
+        for i in range(int(rate * seconds)):
+            delay = start + i / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            requests.append(asyncio.ensure_future(score()))
+        await asyncio.gather(*requests)
+        elapsed = time.perf_counter() - start
+
+        patients = [dict(zip(INPUT_FIELDS, np.where(row, "Yes", "No").tolist())) for row in _random_answers(batch_size)]
+        batch_body = json.dumps({"patients": patients})
+        times = []
+        for _ in range(batches):
+            batch_start = time.perf_counter()
+            await client.fetch(base_url + "/score/batch", method="POST", body=batch_body)
+            times.append(time.perf_counter() - batch_start)
+    finally:
+        client.close()
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "score": {"requests": len(latencies), "rate_per_s": rate, "achieved_rate_per_s": len(latencies) / elapsed,
+                  "p50_ms": float(np.percentile(latencies_ms, 50)), "p99_ms": float(np.percentile(latencies_ms, 99))},
+        "batch": {"batch_size": batch_size, "batches": batches, "median_s": statistics.median(times),
+                  "patients_per_s": batch_size / statistics.median(times)},
+    }
+
+
+def bench_service(rate=SERVICE_RATE, seconds=10, batch_size=SERVICE_BATCH_SIZE, batches=20):
+    """
+    Latency of the scoring service's /score endpoint with requests sent at a steady rate, and throughput of
+    /score/batch, compared with SERVICE_TARGETS. The service is started as python service.py in its own process, with
+    its default settings, and driven from this one with Tornado's HTTP client.
+    """
+    port = _free_port()
+    service = subprocess.Popen([sys.executable, "service.py", "--port", str(port)],
+                               cwd=os.path.dirname(os.path.abspath(__file__)),
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        results = asyncio.run(_drive_service(f"http://127.0.0.1:{port}", rate, seconds, batch_size, batches))
+    finally:
+        service.terminate()
+        service.wait()
+    results["targets"] = SERVICE_TARGETS
+    results["meets_targets"] = (results["score"]["p50_ms"] <= SERVICE_TARGETS["p50_ms"]
+                                and results["score"]["p99_ms"] <= SERVICE_TARGETS["p99_ms"]
+                                and results["batch"]["patients_per_s"] >= SERVICE_TARGETS["batch_patients_per_s"])
+    return results
+
+
+def _import_time_ms(modules, repeat=3):
+    """
+    Best-of-repeat time, in ms, to import the given modules in a fresh interpreter, from python -X importtime. Only
+    the modules themselves (and what they import) are counted, not the interpreter's own startup imports.
+    """
+    best = None
+    for _ in range(repeat):
+        stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modules)],
+                                capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+                                check=True).stderr
+        # Each line is "import time: self [us] | cumulative | name", with nested imports indented under the name
+        total_us = 0
+        for line in stderr.splitlines():
+            fields = line.split("|")
+            if line.startswith("import time:") and len(fields) == 3 and fields[2].strip() in modules \
+                    and not fields[2].startswith("  "):
+                total_us += int(fields[1])
+        best = total_us if best is None else min(best, total_us)
+    return best / 1000
+
+
+def bench_cold_start(repeat=3):
+    """ Import time of each entry point in a fresh interpreter, compared with COLD_START_BUDGETS_MS."""
+    results = {}
+    for name, budget in COLD_START_BUDGETS_MS.items():
+        ms = _import_time_ms(COLD_START_MODULES.get(name, (name,)), repeat)
+        results[name] = {"import_ms": ms, "budget_ms": budget, "within_budget": ms <= budget}
+    return results
+
+
+def environment():
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def write_results(results, path=None):
+    """ Write the results as JSON to path, or print them if no path is given."""
+    output = json.dumps(results, indent=2)
+    if path:
+        with open(path, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the SIRS, sepsis, and septic shock calculator.")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    parser.add_argument("--quick", action="store_true", help="use smaller sizes and fewer repetitions")
+    parser.add_argument("--streaming-rows", type=int, help="rows in the files for the streaming benchmark "
+                                                             "(default: 1,000,000, or 100,000 with --quick)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes for the streaming benchmark")
+    parser.add_argument("--skip-streamlit", action="store_true", help="don't benchmark the Streamlit rerun time")
+    parser.add_argument("--skip-service", action="store_true", help="don't benchmark the scoring service")
+    parser.add_argument("--service-rate", type=int, default=SERVICE_RATE,
+                        help=f"/score requests per second in the service benchmark (default: {SERVICE_RATE})")
+    parser.add_argument("--cold-start-only", action="store_true",
+                        help="only measure import times (and exit with an error if any is over budget)")
+    parser.add_argument("--service-only", action="store_true",
+                        help="only benchmark the scoring service (and exit with an error if it misses its targets)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    streaming_rows = args.streaming_rows or (100_000 if args.quick else 1_000_000)
+    service_seconds = 3 if args.quick else 10
+    results = {"environment": environment()}
+    if args.service_only:
+        results["service"] = bench_service(args.service_rate, service_seconds)
+        write_results(results, args.output)
+        if not results["service"]["meets_targets"]:
+            sys.exit(1)
+        return
+    results["cold_start"] = bench_cold_start(1 if args.quick else 3)
+    if args.cold_start_only:
+        write_results(results, args.output)
+        if not all(result["within_budget"] for result in results["cold_start"].values()):
+            sys.exit(1)
+        return
+    results["single"] = bench_single(10_000 if args.quick else 100_000)
+    results["batch"] = bench_batch(QUICK_BATCH_SIZES if args.quick else BATCH_SIZES)
+    results["streaming"] = bench_streaming(streaming_rows, args.workers)
+    if not args.skip_streamlit:
+        results["streamlit_rerun"] = bench_streamlit_rerun(10 if args.quick else 50)
+    if not args.skip_service:
+        results["service"] = bench_service(args.service_rate, service_seconds)
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
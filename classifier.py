@@ -0,0 +1,198 @@
+"""
+Headless SIRS / sepsis classification engine.
+
+This module holds the same logic that main() uses to decide which result banner to show, but has no
+Streamlit dependency so it can be imported by batch jobs, services, etc. without paying for the UI.
+"""
+from collections import namedtuple
+
+# Severity tiers, in increasing order of precedence. The values match the if/elif ladder in main():
+# MODS > septic shock > severe sepsis > sepsis > SIRS > none.
+NO_SIRS = 0
+SIRS = 1
+SEPSIS = 2
+SEVERE_SEPSIS = 3
+SEPTIC_SHOCK = 4
+MODS = 5
+
+TIER_NAMES = ("No SIRS", "SIRS", "Sepsis", "Severe Sepsis", "Septic Shock", "Multiple Organ Dysfunction Syndrome")
+
+# The eight Yes/No questions asked in main(), in the order they're asked. The position of each field is also
+# its bit in the packed input code (temperature is bit 0, multi_organ_failure is bit 7).
+INPUT_FIELDS = (
+    "temperature",
+    "heart_rate",
+    "respiratory_rate",
+    "white_blood_cells",
+    "sepsis",
+    "severe_sepsis",
+    "septic_shock",
+    "multi_organ_failure",
+)
+SIRS_FIELDS = INPUT_FIELDS[:4]
+
+
+def is_missing(answer):
+    """ Whether an answer is missing: None, NaN, or pd.NA."""
+    if answer is None:
+        return True
+    try:
+        return not answer == answer # NaN is the only value not equal to itself
+    except TypeError: # pd.NA refuses to be converted to a bool
+        return True
+
+
+def is_met(answer):
+    """
+    Whether one answer counts as met: "Yes", or a true bool or non-zero number. Missing answers (None, NaN, pd.NA)
+    never count, the same as leaving the question on "No". Strings other than "Yes" and "No" raise ValueError.
+    """
+    if isinstance(answer, str):
+        if answer == "Yes":
+            return True
+        if answer == "No":
+            return False
+        raise ValueError(f'Answers must be "Yes" or "No", got {str(answer)!r}')
+    return not is_missing(answer) and bool(answer)
+
+
+class PatientInputs:
+    """The answers to the eight Yes/No questions for a single patient, stored as booleans."""
+    __slots__ = INPUT_FIELDS
+
+    def __init__(self, temperature=False, heart_rate=False, respiratory_rate=False, white_blood_cells=False,
+                 sepsis=False, severe_sepsis=False, septic_shock=False, multi_organ_failure=False):
+        self.temperature = bool(temperature)
+        self.heart_rate = bool(heart_rate)
+        self.respiratory_rate = bool(respiratory_rate)
+        self.white_blood_cells = bool(white_blood_cells)
+        self.sepsis = bool(sepsis)
+        self.severe_sepsis = bool(severe_sepsis)
+        self.septic_shock = bool(septic_shock)
+        self.multi_organ_failure = bool(multi_organ_failure)
+
+    @classmethod
+    def from_answers(cls, **answers):
+        """ Build the inputs from "Yes"/"No" answers, as returned by the st.radio widgets in main()."""
+        return cls(**{name: answer == "Yes" for name, answer in answers.items()})
+
+    @classmethod
+    def from_code(cls, code):
+        """ Unpack an 8-bit input code (see to_code()) back into the inputs."""
+        return cls(*((code >> bit) & 1 for bit in range(len(INPUT_FIELDS))))
+
+    def to_code(self):
+        """ Pack the inputs into an 8-bit integer, one bit per question in INPUT_FIELDS order."""
+        code = 0
+        for bit, name in enumerate(INPUT_FIELDS):
+            if getattr(self, name):
+                code |= 1 << bit
+        return code
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)}" for name in INPUT_FIELDS)
+        return f"PatientInputs({fields})"
+
+
+_ResultFields = namedtuple("_ResultFields", (
+    "sirs_criteria_met", "has_sirs", "has_sepsis", "has_severe_sepsis", "has_septic_shock",
+    "has_multi_organ_dysfunction_syndrome", "tier", "banner", "message"), defaults=(None, None))
+
+
+class Result(_ResultFields):
+    """
+    The outcome of classifying one patient, including the result banner main() shows for it: banner is the name of
+    the Streamlit function to show it with ("info", "warning" or "error") and message is its text.
+
+    Results are immutable, since classify() hands out the same shared Result from OUTCOMES to every caller.
+    """
+    __slots__ = ()
+
+    @property
+    def tier_name(self):
+        return TIER_NAMES[self.tier]
+
+    def __repr__(self):
+        return (f"Result(sirs_criteria_met={self.sirs_criteria_met}, tier={self.tier_name!r}, "
+                f"has_sepsis={self.has_sepsis})")
+
+
+def _evaluate(inputs):
+    """ Work out the Result for one patient from scratch. Only used to build OUTCOMES."""
+    # Check SIRS criteria
+    sirs_criteria_met = (inputs.temperature + inputs.heart_rate + inputs.respiratory_rate
+                         + inputs.white_blood_cells)
+    has_sirs = sirs_criteria_met >= 2 # If patient meets >= 2 of the criteria, he/she has SIRS
+
+    # Check sepsis, severe sepsis, septic shock, and multi-organ dysfunction criteria
+    has_sepsis = has_sirs and inputs.sepsis
+    has_severe_sepsis = has_sirs and inputs.severe_sepsis
+    has_septic_shock = has_sirs and inputs.septic_shock
+    has_multi_organ_dysfunction_syndrome = has_sirs and inputs.multi_organ_failure
+
+    # Same precedence as the result banners (see _banner())
+    if has_multi_organ_dysfunction_syndrome:
+        tier = MODS
+    elif has_septic_shock:
+        tier = SEPTIC_SHOCK
+    elif has_severe_sepsis:
+        tier = SEVERE_SEPSIS
+    elif has_sepsis:
+        tier = SEPSIS
+    elif has_sirs:
+        tier = SIRS
+    else:
+        tier = NO_SIRS
+
+    result = Result(sirs_criteria_met, has_sirs, has_sepsis, has_severe_sepsis, has_septic_shock,
+                    has_multi_organ_dysfunction_syndrome, tier)
+    banner, message = _banner(result)
+    return result._replace(banner=banner, message=message)
+
+
+def _banner(result):
+    """ The (Streamlit function name, message) of the result banner for a patient."""
+    if not result.has_sirs:
+        return "info", "This patient does not meet SIRS criteria. For other causes of shock, see the Next Steps section."
+    if result.has_multi_organ_dysfunction_syndrome:
+        if result.has_sepsis:
+            return "error", "**This patient meets multiple organ dysfunction syndrome criteria. Follow your guidelines for sepsis, \
+                    which typically include aggresive fluid resuscitation, early, broad-spectrum antibiotics, ICU consultation,\
+                    CVP evaluation, and occasionally pressors and transfusion.**"
+        else:
+            return "error", "**This patient meets multiple organ dysfunction syndrome criteria.**"
+    elif result.has_septic_shock:
+        if result.has_sepsis:
+            return "error", "**This patient meets septic shock criteria. Follow your guidelines for sepsis, which typically include\
+                    aggressive fluid resuscitation, early, broad-spectrum antibiotics, ICU consultation, CVP evaluation,\
+                    and occasionally pressors and transfusion.**"
+        else:
+            return "error", "**This patient meets septic shock criteria.**"
+    elif result.has_severe_sepsis:
+        if result.has_sepsis:
+            return "warning", "**This patient meets severe sepsis criteria. Follow your guidelines for sepsis, which typically include\
+                    aggressive fluid resuscitation, early, broad-spectrum antibiotics, ICU consultation, CVP evaluation, and\
+                    occasionally pressors and transfusion.**"
+        else:
+            return "warning", "**This patient meets severe sepsis criteria.**"
+    elif result.has_sepsis:
+        return "warning", "**This patient meets sepsis criteria. Follow your guidelines for sepsis, which typically include aggressive\
+                fluid resuscitation, early, broad-spectrum antibiotics, ICU consultation, CVP evaluation, and occasionally\
+                pressors and transfusion.**"
+    elif result.has_sirs:
+        return "info", "**This patient meets SIRS criteria.**"
+
+
+# The Result for every possible 8-bit input code (see PatientInputs.to_code()). There are only 256 combinations of
+# answers, so they're all worked out once at import and classifying a patient is just an index into this table.
+OUTCOMES = tuple(_evaluate(PatientInputs.from_code(code)) for code in range(1 << len(INPUT_FIELDS)))
+
+
+def classify_code(code):
+    """ Return the Result for an 8-bit input code."""
+    return OUTCOMES[code]
+
+
+def classify(inputs):
+    """ Classify a single patient's PatientInputs and return a Result."""
+    return OUTCOMES[inputs.to_code()]
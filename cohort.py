@@ -0,0 +1,167 @@
+"""
+Population-level reporting over scored results (e.g. the output of score.py).
+
+CohortRollup keeps running totals that can be added to as new scored data arrives, without going back over the
+history:
+- counts of each severity tier per unit and per hour
+- the distribution of the number of SIRS criteria met, per unit
+- counts of tier-to-tier transitions between consecutive observations of the same patient (with each patient's latest
+  tier carried over, so transitions that span two updates are counted too)
+
+Everything is computed with grouped pandas operations, and a roll-up can be saved to and loaded from a directory of
+Parquet files. The Streamlit dashboard in pages/ reads a saved roll-up.
+
+    python cohort.py rollup_dir scored_2023.parquet scored_2024.parquet   # add scored files to a roll-up
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from classifier import SIRS_FIELDS, TIER_NAMES
+
+# Columns read from the scored data
+UNIT_COLUMN = "unit"
+TIME_COLUMN = "time"
+PATIENT_COLUMN = "encounter_id"
+
+
+class CohortRollup:
+    """
+    Running totals over scored data. Each update() only looks at the new rows, plus each patient's latest tier from
+    earlier updates. New data for a patient is expected to come after what's already been added for them.
+    """
+
+    def __init__(self, unit_column=UNIT_COLUMN, time_column=TIME_COLUMN, patient_column=PATIENT_COLUMN):
+        self.unit_column = unit_column
+        self.time_column = time_column
+        self.patient_column = patient_column
+        # Rows per (unit, hour, tier)
+        self.hourly_tiers = pd.Series(dtype=np.int64, index=pd.MultiIndex.from_arrays(
+            [[], pd.DatetimeIndex([]), []], names=["unit", "hour", "tier"]))
+        # Rows per (unit, sirs_criteria_met)
+        self.sirs_counts = pd.Series(dtype=np.int64, index=pd.MultiIndex.from_arrays(
+            [[], []], names=["unit", "sirs_criteria_met"]))
+        # transitions[i, j] is how often a patient's tier went from i to j between consecutive observations
+        self.transitions = np.zeros((len(TIER_NAMES), len(TIER_NAMES)), dtype=np.int64)
+        # Each patient's latest (time, tier), for transitions that span updates
+        self.latest = pd.DataFrame({"time": pd.Series(dtype="datetime64[ns]"), "tier": pd.Series(dtype=np.int8)})
+        self.rows = 0
+
+    def update(self, scored):
+        """ Add a DataFrame of scored rows (with tier, sirs_criteria_met, unit, time, and patient columns)."""
+        if scored.empty:
+            return self
+        times = pd.to_datetime(scored[self.time_column]).to_numpy()
+        # Units and patient ids are kept as text, so ids read as ints from CSV and as strings from Parquet match up
+        units = scored[self.unit_column].astype(str).to_numpy()
+        patients = scored[self.patient_column].astype(str).to_numpy()
+        tiers = scored["tier"].to_numpy(dtype=np.int8)
+        rows = pd.DataFrame({"unit": units, "hour": pd.DatetimeIndex(times).floor(pd.Timedelta(hours=1)),
+                             "tier": tiers, "sirs_criteria_met": scored["sirs_criteria_met"].to_numpy(),
+                             "patient": patients, "time": times})
+
+        hourly = rows.groupby(["unit", "hour", "tier"]).size()
+        self.hourly_tiers = self.hourly_tiers.add(hourly, fill_value=0).astype(np.int64)
+        sirs = rows.groupby(["unit", "sirs_criteria_met"]).size()
+        self.sirs_counts = self.sirs_counts.add(sirs, fill_value=0).astype(np.int64)
+
+        # Transitions: order each patient's rows by time, pair every row with the one before it, and use the patient's
+        # latest tier from earlier updates for their first row here.
+        rows = rows[["patient", "time", "tier"]].sort_values(["patient", "time"], kind="stable", ignore_index=True)
+        previous = rows.groupby("patient", sort=False)["tier"].shift(1)
+        first = previous.isna()
+        previous[first] = rows.loc[first, "patient"].map(self.latest["tier"])
+        paired = previous.notna().to_numpy()
+        pairs = previous.to_numpy()[paired].astype(np.int64) * len(TIER_NAMES) + rows["tier"].to_numpy()[paired]
+        self.transitions += np.bincount(pairs, minlength=len(TIER_NAMES) ** 2).reshape(self.transitions.shape)
+
+        last = rows.groupby("patient", sort=False).tail(1).set_index("patient")[["time", "tier"]]
+        self.latest = pd.concat([self.latest[~self.latest.index.isin(last.index)], last])
+        self.rows += len(scored)
+        return self
+
+    def tier_counts_by_hour(self, units=None):
+        """ DataFrame of tier counts with one row per (unit, hour) and one column per tier name."""
+        counts = self.hourly_tiers
+        if units is not None:
+            counts = counts[counts.index.get_level_values("unit").isin(units)]
+        table = counts.unstack("tier", fill_value=0).reindex(columns=range(len(TIER_NAMES)), fill_value=0)
+        table.columns = list(TIER_NAMES)
+        return table
+
+    def tier_counts_by_unit(self, units=None):
+        """ DataFrame of tier counts with one row per unit."""
+        return self.tier_counts_by_hour(units).groupby(level="unit").sum()
+
+    def sirs_distribution(self, units=None):
+        """ DataFrame with one row per unit and the number of rows meeting 0-4 SIRS criteria as columns."""
+        counts = self.sirs_counts
+        if units is not None:
+            counts = counts[counts.index.get_level_values("unit").isin(units)]
+        return counts.unstack("sirs_criteria_met", fill_value=0).reindex(
+            columns=range(len(SIRS_FIELDS) + 1), fill_value=0)
+
+    def transition_rates(self):
+        """ DataFrame of P(next tier | current tier) between consecutive observations of the same patient."""
+        totals = self.transitions.sum(axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rates = np.where(totals > 0, self.transitions / totals, 0.0)
+        return pd.DataFrame(rates, index=list(TIER_NAMES), columns=list(TIER_NAMES))
+
+    def save(self, directory):
+        """ Save the roll-up as Parquet files in directory, so later runs can load() it and keep adding to it."""
+        os.makedirs(directory, exist_ok=True)
+        self.hourly_tiers.rename("rows").reset_index().to_parquet(os.path.join(directory, "hourly_tiers.parquet"))
+        self.sirs_counts.rename("rows").reset_index().to_parquet(os.path.join(directory, "sirs_counts.parquet"))
+        pd.DataFrame(self.transitions, columns=[str(tier) for tier in range(len(TIER_NAMES))]).to_parquet(
+            os.path.join(directory, "transitions.parquet"))
+        self.latest.rename_axis("patient").reset_index().to_parquet(os.path.join(directory, "latest.parquet"))
+        pd.DataFrame({"unit_column": [self.unit_column], "time_column": [self.time_column],
+                      "patient_column": [self.patient_column], "rows": [self.rows]}).to_parquet(
+            os.path.join(directory, "meta.parquet"))
+
+    @classmethod
+    def load(cls, directory):
+        """ Load a roll-up saved with save()."""
+        meta = pd.read_parquet(os.path.join(directory, "meta.parquet")).iloc[0]
+        rollup = cls(meta["unit_column"], meta["time_column"], meta["patient_column"])
+        rollup.hourly_tiers = pd.read_parquet(os.path.join(directory, "hourly_tiers.parquet")).set_index(
+            ["unit", "hour", "tier"])["rows"]
+        rollup.sirs_counts = pd.read_parquet(os.path.join(directory, "sirs_counts.parquet")).set_index(
+            ["unit", "sirs_criteria_met"])["rows"]
+        rollup.transitions = np.array(pd.read_parquet(os.path.join(directory, "transitions.parquet")), dtype=np.int64)
+        rollup.latest = pd.read_parquet(os.path.join(directory, "latest.parquet")).set_index("patient")
+        rollup.rows = int(meta["rows"])
+        return rollup
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Add scored CSV or Parquet files to a cohort roll-up.")
+    parser.add_argument("rollup", help="directory holding the roll-up (created if it doesn't exist)")
+    parser.add_argument("scored", nargs="+", help="scored files, e.g. from score.py with --keep unit time encounter_id")
+    parser.add_argument("--unit-column", default=UNIT_COLUMN)
+    parser.add_argument("--time-column", default=TIME_COLUMN)
+    parser.add_argument("--patient-column", default=PATIENT_COLUMN)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    from score import iter_chunks
+
+    args = parse_args(argv)
+    if os.path.exists(os.path.join(args.rollup, "meta.parquet")):
+        rollup = CohortRollup.load(args.rollup)
+    else:
+        rollup = CohortRollup(args.unit_column, args.time_column, args.patient_column)
+    columns = [rollup.unit_column, rollup.time_column, rollup.patient_column, "tier", "sirs_criteria_met"]
+    for path in args.scored:
+        for chunk in iter_chunks(path, columns=columns):
+            rollup.update(chunk)
+    rollup.save(args.rollup)
+    print(f"{args.rollup}: {rollup.rows:,} rows")
+
+
+if __name__ == "__main__":
+    main()
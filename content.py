@@ -0,0 +1,230 @@
+"""
+Static educational text shown by the buttons in main().
+
+Everything here is built once, when the module is first imported, rather than on every Streamlit rerun.
+"""
+
+# Bullets for the buttons after the instructions. Each one is written with its own st.write() call.
+WHEN_TO_USE = (
+    "- Patients who present with two or more *SIRS* criteria and a suspected or confirmed "
+        "infection should be screened for Severe Sepsis.",
+    "- Currently, many institutions encourage or even mandate obtaining a lactic acid level on "
+       "these patients. A lactate ≥4 mmol/L is considered the cutoff value for the diagnosis of "
+       "severe sepsis and the initiation of *Early Goal-Directed Therapy (EGDT)*.",
+    "- Patients who meet the above criteria but are persistently hypotensive despite the initiation of "
+        "intravenous fluid resuscitation are in Septic Shock, and aggressive resuscitation measures should be "
+        "initiated immediately.",
+)
+
+PEARLS_AND_PITFALLS = (
+    "- *SIRS*, *Sepsis*, *Severe Sepsis*, and *Septic Shock* criteria were chosen by a panel of "
+    "experts and not prospectively or retrospectively derived from large-scale population studies.",
+    "- There remains controversy over the sensitivity and specificity of these criteria, even though "
+    "they have been largely adopted for research and in clinical practice.",
+    "- *SIRS* is commonly used as a screening tool in the emergency department to identify patients "
+    "at risk for *Severe Sepsis*. These criteria have not been validated in this setting, however.",
+    "- Clinical judgment remains vital since a significant number of patients presenting to "
+    "emergency departments will meet the criteria for *Sepsis* but do not require further screening or management.",
+    "- For example, a 21-year-old healthy male with a viral illness can present with a fever "
+    "and tachycardia. While this patient meets the definition of *Sepsis*, one can easily argue "
+    "further investigation and aggressive interventions are likely unnecessary if the patient "
+    "is well-appearing.",
+)
+
+WHY_USE = (
+    "- Early initiation of broad-spectrum antibiotics and aggressive resuscitative measures have been "
+      "shown to decrease mortality in patients with *Severe Sepsis* and *Septic Shock*. The early recognition of these "
+      "conditions is therefore of the utmost importance.",
+    "- *SIRS* criteria are mostly used as a screening tool to identify patients who may need further workup "
+    "for *sepsis* and *severe sepsis*. In the emergency department, it is a triage tool that helps determine patient "
+     "acuity and identify patients who are potentially septic and need further screening.",
+    "- *Severe Sepsis* and *Septic Shock* are universally accepted as indications to initiate sepsis "
+    "management protocols such as *Early Goal-Directed Therapy*.",
+    "- Having clearly defined criteria for *SIRS*, *Sepsis*, *Severe Sepsis*, and *Septic Shock* is also "
+    "important in order to standardize clinical research, as well as institutional protocols "
+    "for the management of these conditions.",
+)
+
+
+def _next_steps():
+    # Using a list to store each line for easier management
+    lines = []
+    
+    # Adding the header
+    lines.append("**MANAGEMENT**")
+    
+    # Adding the content
+    lines.append(
+        "- When a patient presents with two or more *SIRS* criteria but with hemodynamic stability "
+        "(i.e., blood pressure at baseline), a clinical assessment must be made to determine the "
+        "possibility of an infectious etiology."
+    )
+    lines.append(
+        "- If an infection is suspected or confirmed, the patient is diagnosed with *Sepsis*, and a "
+         "lactate level is obtained to determine the degree of hypoperfusion and inflammation. A "
+         "lactate level ≥4 mmol/L is considered diagnostic for *Severe Sepsis*, and aggressive management "
+         "with broad-spectrum antibiotics, intravenous fluids, and vasopressors should be initiated "
+         "(aka *EGDT*)."
+         )
+    lines.append(
+        "- Patients who present with a suspected or confirmed infection AND hemodynamic instability "
+        "should immediately be treated for *Septic Shock*. While SIRS criteria will likely be present in "
+        "these patients, aggressive management should not be delayed while waiting for laboratory values "
+        "such as the WBC or lactate."
+    )
+    lines.append("- The management of *Severe Sepsis* and *Septic Shock* is the topic of intense research and scrutiny.")
+    lines.append(
+        "- While *Early Goal-Directed Therapy* has been advocated in the *Surviving Sepsis Guidelines*, there "
+        "remains controversy as to which of the bundled interventions are necessary."
+    )
+    lines.append(
+        '- Recent studies have shown *EGDT* not to be better than "usual care", and called for significant '
+        'amendments to currently used sepsis protocols.'
+    )
+    lines.append(
+        "- To date, most experts agree that early recognition of *Sepsis*, *Severe Sepsis*, and *Septic Shock*, "
+        "and early administration of broad-spectrum and organism-specific antibiotics are the most critical "
+        "actions."
+    )
+    lines.append(
+        "- There remains controversy in the type of fluids that should be used, "
+        "their quantity, and the timing of vasopressors and/or inotropes.\n  "
+    )
+
+    lines.append("\n**CRITICAL ACTIONS**")
+    lines.append("- Assess all patients with 2 or more *SIRS* criteria for the possibility of an infectious etiology.")
+    lines.append(
+        "- Screen for *Severe Sepsis* by obtaining a lactate level on patients with *Sepsis*, " 
+        "that are elderly, immunocompromised, or ill-appearing."
+    )
+    lines.append(
+        "- Some experts recommend obtaining a lactate level on all patients in whom blood cultures are sent. "
+        "This is institution dependent however and not mandated in any guidelines."
+    )
+    lines.append(
+        "- When *Severe Sepsis* or *Septic Shock* is identified, initiate broad-spectrum antibiotics immediately. "
+        "These antibiotics should be organism-specific and therefore institutional antibiograms should be used."
+    )
+    lines.append(
+        "- The *Surviving Sepsis Campaign Guidelines* recommend initiation of antimicrobials within one hour from the time "
+        "of recognition of *Severe Sepsis* or *Septic Shock*, or within three hours of the patient’s arrival to the hospital."
+    )
+                
+    # Joining the lines together with newline characters
+
+    # Joining the lines together with newline characters
+    return '\n'.join(lines)
+
+
+def _sepsis_information():
+    # Using a list to store each section for easier management
+    sections = []
+    
+    # Adding the header and content
+    sections.append("**FORMULA**\n")
+    sections.append("- Series of Yes/No questions.\n")
+    
+    sections.append("**FACTS & FIGURES**")
+    sections.append("- SIRS - 2 YES answers meets criteria.")
+    sections.append("- Sepsis Criteria - 2 YES of SIRS + Suspected Source of Infection.")
+    sections.append("- Severe Sepsis Criteria - 2 YES of SIRS + Lactic Acidosis, SBP.")
+    sections.append("- Multiple Organ Dysfunction Syndrome - 2 YES of SIRS + Evidence of ≥ 2 Organs Failing.\n")
+    sections.append("Check with your own hospital for its sepsis guidelines, sepsis 'bundle', or sepsis algorithm. "
+                    "Two excellent sepsis references ([1](https://emcrit.org/squirt/severe-sepsis-resources/), "
+                    "[2](https://crashingpatient.com/wp-content/pdf/Loma%20Linda%20STOP%20Sepsis%20Bundle.pdf)) "
+                    "come from the [EMCrit](https://emcrit.org/) website.\n")
+    
+    sections.append("**EVIDENCE APPRAISAL**")
+    sections.append("- [This paper](https://pubmed.ncbi.nlm.nih.gov/1303622/) was released after the first consensus conference in 1991. The goal of this "
+                    "conference was to standardize the use of terms such as “SIRS”, “sepsis”, “severe sepsis”, and "
+                    "“septic shock” to facilitate enrollment of patients in clinical trials.")
+    sections.append("- In 2001, the International Sepsis Definitions Conference expanded on these definitions by "
+                    "adding additional elements such as laboratory data. See [here](https://pubmed.ncbi.nlm.nih.gov/12682500/).\n")
+    
+    sections.append("**LITERATURE**\n")
+    sections.append("ORIGINAL/PRIMARY REFERENCE")
+    sections.append("- [International Guidelines for Management of Severe Sepsis and Septic Shock: "
+                    "2012](https://content.guidelinecentral.com/guideline/get/pdf/3525)")
+    sections.append("- Bone RC, Balk RA, Cerra FB, Dellinger RP, Fein AM, Knaus WA, Schein RM, Sibbald WJ. "
+                    "[Definitions for sepsis and organ failure and guidelines for the use of innovative therapies in "
+                    "sepsis.](https://pubmed.ncbi.nlm.nih.gov/1303622/) The ACCP/SCCM Consensus "
+                    "Conference Committee. American College of Chest "
+                    "Physicians/Society of Critical Care Medicine.Chest. 1992 Jun;101(6):1644-55.\n")
+    
+    sections.append("CLINICAL PRACTICE GUIDELINES")
+    sections.append("- [Surviving Sepsis Campaign: International Guidelines for Management of Sepsis and "
+                    "Septic Shock](https://journals.lww.com/ccmjournal/Fulltext/2021/11000/Surviving_Sepsis_Campaign__International.21.aspx): "
+                    "Critical Care Medicine\n")
+    
+    sections.append("OTHER REFERENCES")
+    sections.append("- [Surviving Sepsis Campaign Responds to ProCESS Trial](https://www.icnarc.org/DataServices/Attachments/Download/3d1bc8e1-1ed1-e311-a997-d48564544b14).")
+    sections.append("- Levy MM, Fink MP, Marshall JC, et al. [2001 SCCM/ESICM/ACCP/ATS/SIS International Sepsis "
+                    "Definitions Conference](https://pubmed.ncbi.nlm.nih.gov/12682500/). Crit Care Med. 2003;31(4):1250–1256.")
+    
+    # Joining the sections together with newline characters
+
+    # Joining the sections together with newline characters
+    return '\n'.join(sections)
+
+
+def _creator_insights():
+    sections = []
+    sections.append( "**Why did you issue the consensus statement on the SIRS Criteria and Septic protocol? "
+        "Was there a clinical experience that inspired you to update these guidelines for clinicians?**\n")
+    sections.append("The American College of Chest Physicians and the Society of Critical Care Medicine convened "
+        "the first sepsis definitions conference in 1991 to help researchers define a population of severe "
+        "septic patients who would be suitable for enrollment in clinical trials of new investigational agents "
+        "that were thought to be able to block the proinflammatory cascade, and thus improve "
+        "survival of patients with severe sepsis and septic shock. To accomplish this goal, the conference "
+        "participants aimed to use readily available clinical signs, symptoms, and basic laboratory studies "
+        "that would then support a rapid diagnosis. The trade-off for such a sensitive group of parameters "
+        "that would alert physicians to the early manifestations of severe sepsis and septic shock was "
+        "a group of criteria that lacked a great deal of specificity. It was also recognized that the same "
+        "clinical signs, symptoms, and laboratory data seen in patients with severe sepsis and septic shock "
+        "were also present in other populations of critically ill patients with other proinflammatory conditions"
+        ", such as trauma, burns, pancreatitis, etc. It was therefore decided to define the patients with a "
+        "documented or highly suspicious infection that results in a systemic inflammatory response as having "
+        "sepsis. In the ICU, sepsis patients would typically manifest organ dysfunction (severe sepsis) "
+        "or septic shock, with or without multiple organ dysfunction syndrome.\n")
+    sections.append("The second goal of the consensus conference was to facilitate better communication in the literature "
+        "and scientific communication (including on rounds), which will enhance future comparative efforts "
+        "among clinical trials and facilitate outcome comparisons of septic populations.\n")
+    sections.append("**What pearls, pitfalls, and/or tips do you have for users of the SIRS Criteria? Are there cases "
+        "in which they have been applied, interpreted, or used inappropriately?**\n")
+    sections.append("Users of the SIRS-Sepsis criteria need to understand that they are overly sensitive to identify "
+        "potential patients as early as possible, but the criteria lack specificity. The 2001 International "
+        "Sepsis Definition Conference attempted to enhance the utility and specificity of the definition "
+        "by including additional signs, symptoms, laboratory data, biomarkers, and physiologic parameters. "
+        "Unfortunately, we are still awaiting the perfect clinical definition that has both high sensitivity "
+        "and specificity for severe sepsis and septic shock.\n"
+        )
+    sections.append("For example, if you believe the patient has an infection AND meets the SIRS criteria, then the "
+        "patient may be septic. Infection is likely its most useful application. The score is designed "
+        "to be sensitive but not specific. It's meant to help with early diagnosis. SIRS was not designed "
+        "to be algorithmic, such as: if you have a score of X, you must do Y. Rather, it's a table of points to "
+        "see whether or not the patient has any of these criteria. You then apply that result to the specific "
+        "clinical scenario.\n")
+    sections.append( "**What recommendations do you have for healthcare providers once they have applied the SIRS Criteria? "
+                     "Are there any adjustments or updates you would make to the criteria, given recent changes in medicine?**\n")
+    sections.append( "Investigators are continuing to refine the SIRS - Sepsis criteria and make them more clinically useful. "
+        "The current approach has involved the use of various biomarkers to facilitate the identification "
+        "of patients with a high likelihood of bacterial infection and/or high risk for morbidity and mortality. "
+        "Some of the current biomarkers under evaluation include procalcitonin, C-reactive protein, "
+        "proadrenalmodulin, N-terminal BNP, and lactate.\n")
+    sections.append("**Other comments? Any new research or papers on this topic in the pipeline?**\n")
+    sections.append("The future will likely include significant refinements in the SIRS criteria using biomarkers and PCR or "
+        "nanotechnology to improve the specificity of the diagnosis and provide the information "
+        "in a more rapid fashion.\n")
+    sections.append("**ABOUT THE CREATOR**\n")
+    sections.append("Robert A. Balk, MD, is a professor and practicing physician in pulmonology, internal medicine, and "
+        "critical care at Rush University Medical Center. His research interests include septic shock, acute "
+        "lung injury, acute respiratory distress syndrome, and ventilator-associated pneumonia.\n")
+    sections.append("*To view Dr. Robert A. Balk's publications, visit " 
+        "[PubMed](https://pubmed.ncbi.nlm.nih.gov/?term=Balk+RA%5BAuthor%5D)*.")
+    return '\n'.join(sections)
+
+
+NEXT_STEPS = _next_steps()
+SEPSIS_INFORMATION = _sepsis_information()
+CREATOR_INSIGHTS_HEADER = "From the creator Dr. Robert A. Balk"
+CREATOR_INSIGHTS = _creator_insights()
@@ -0,0 +1,222 @@
+"""
+Criteria sets defined as data and compiled into lookup tables.
+
+A criteria set is a plain dict (or a JSON file with the same shape), so local variants can be written without
+touching any code:
+
+    {
+        "name": "SIRS, Sepsis, and Septic Shock Criteria",
+        "scores": {"sirs": {"fields": ["temperature", "heart_rate", "respiratory_rate", "white_blood_cells"],
+                            "at_least": 2}},
+        "default_tier": "No SIRS",
+        "tiers": [
+            {"name": "SIRS", "rule": "sirs"},
+            {"name": "Sepsis", "rule": {"all": ["sirs", "sepsis"]}},
+            ...
+        ]
+    }
+
+"scores" count how many of their fields (one or more distinct input fields) are answered "Yes"; a score's name, which
+can't be an input field's name, can be used in a rule and is true when at least "at_least" of its fields are. A rule is a field name from classifier.INPUT_FIELDS, a score name, or
+{"all": [rules]}, {"any": [rules]}, or {"not": rule}. Tiers are listed from lowest to highest precedence: a patient
+gets the last tier whose rule they meet, or default_tier if none.
+
+Since every input is Yes/No and there are only eight of them, compile_criteria() evaluates the rules once for all 256
+combinations of answers. Classifying patients is then a single table lookup per patient, so several criteria sets
+can be run side by side over the same batch (see compare()) at the same speed as one.
+"""
+import json
+
+import numpy as np
+
+from batch import pack_codes
+from classifier import INPUT_FIELDS, SIRS_FIELDS
+
+_SIRS_SCORE = {"sirs": {"fields": list(SIRS_FIELDS), "at_least": 2}}
+
+# The criteria used by the calculator (the same results as classifier.classify())
+SIRS_SEPSIS = {
+    "name": "SIRS, Sepsis, and Septic Shock Criteria",
+    "scores": _SIRS_SCORE,
+    "default_tier": "No SIRS",
+    "tiers": [
+        {"name": "SIRS", "rule": "sirs"},
+        {"name": "Sepsis", "rule": {"all": ["sirs", "sepsis"]}},
+        {"name": "Severe Sepsis", "rule": {"all": ["sirs", "severe_sepsis"]}},
+        {"name": "Septic Shock", "rule": {"all": ["sirs", "septic_shock"]}},
+        {"name": "Multiple Organ Dysfunction Syndrome", "rule": {"all": ["sirs", "multi_organ_failure"]}},
+    ],
+}
+
+# A stricter local variant: severe sepsis, septic shock, and MODS also require a suspected or present source of
+# infection, as in the wording of the original consensus definitions.
+SIRS_SEPSIS_INFECTION_REQUIRED = {
+    "name": "SIRS, Sepsis, and Septic Shock Criteria (infection required)",
+    "scores": _SIRS_SCORE,
+    "default_tier": "No SIRS",
+    "tiers": [
+        {"name": "SIRS", "rule": "sirs"},
+        {"name": "Sepsis", "rule": {"all": ["sirs", "sepsis"]}},
+        {"name": "Severe Sepsis", "rule": {"all": ["sirs", "sepsis", "severe_sepsis"]}},
+        {"name": "Septic Shock", "rule": {"all": ["sirs", "sepsis", "septic_shock"]}},
+        {"name": "Multiple Organ Dysfunction Syndrome", "rule": {"all": ["sirs", "sepsis", "multi_organ_failure"]}},
+    ],
+}
+
+BUILT_IN = {
+    "sirs_sepsis": SIRS_SEPSIS,
+    "infection_required": SIRS_SEPSIS_INFECTION_REQUIRED,
+}
+
+# Bits of every possible input code, one boolean array of 256 per field
+_ALL_CODES = np.arange(1 << len(INPUT_FIELDS))
+_FIELD_VALUES = {name: (_ALL_CODES >> bit & 1).astype(bool) for bit, name in enumerate(INPUT_FIELDS)}
+
+
+class CompiledCriteria:
+    """ A criteria set compiled into lookup tables indexed by 8-bit input code (see classifier.PatientInputs)."""
+    __slots__ = ("name", "tier_names", "tier_table", "score_tables")
+
+    def __init__(self, name, tier_names, tier_table, score_tables):
+        self.name = name
+        self.tier_names = tier_names
+        self.tier_table = tier_table
+        self.score_tables = score_tables
+
+    def classify_codes(self, codes):
+        """ Tier index (into tier_names) for each input code."""
+        return self.tier_table[codes]
+
+    def classify_frame(self, df):
+        """
+        Classify every row of a DataFrame with one Yes/No column per question in INPUT_FIELDS. Returns a DataFrame
+        with a "<score>_criteria_met" column per score, plus tier and tier_name.
+        """
+        return self.classify_packed(_pack_frame(df), df.index)
+
+    def classify_packed(self, codes, index=None):
+        """ Like classify_frame(), but for an array of input codes from batch.pack_codes()."""
+        import pandas as pd
+        out = pd.DataFrame({f"{score}_criteria_met": table[codes] for score, table in self.score_tables.items()},
+                           index=index)
+        tier = self.tier_table[codes]
+        out["tier"] = tier
+        out["tier_name"] = pd.Categorical.from_codes(tier, categories=self.tier_names)
+        return out
+
+    def __repr__(self):
+        return f"CompiledCriteria({self.name!r}, tiers={self.tier_names!r})"
+
+
+def _evaluate(rule, scores, path):
+    """ Evaluate a rule for all 256 input codes at once."""
+    if isinstance(rule, str):
+        if rule in _FIELD_VALUES:
+            return _FIELD_VALUES[rule]
+        if rule in scores:
+            return scores[rule]
+        raise ValueError(f"{path}: unknown field or score {rule!r}")
+    if isinstance(rule, dict) and len(rule) == 1:
+        (operator, operands), = rule.items()
+        if operator == "not":
+            return ~_evaluate(operands, scores, f"{path}.not")
+        if operator in ("all", "any") and isinstance(operands, list) and operands:
+            values = [_evaluate(operand, scores, f"{path}.{operator}[{i}]") for i, operand in enumerate(operands)]
+            return np.logical_and.reduce(values) if operator == "all" else np.logical_or.reduce(values)
+    raise ValueError(f'{path}: a rule must be a field or score name, or {{"all"|"any": [rules]}} or {{"not": rule}}')
+
+
+# JSON names for the types checked by _require()
+_TYPE_NAMES = {dict: "an object", list: "a list", str: "a string", int: "a whole number"}
+
+
+def _require(mapping, key, path, kind):
+    """ mapping[key], or a ValueError naming path if it's missing or not of the given kind."""
+    if not isinstance(mapping, dict):
+        raise ValueError(f"{path}: must be an object")
+    if key not in mapping:
+        raise ValueError(f"{path}: missing {key!r}")
+    value = mapping[key]
+    if not isinstance(value, kind) or isinstance(value, bool):
+        raise ValueError(f"{path}: {key!r} must be {_TYPE_NAMES[kind]}")
+    return value
+
+
+def compile_criteria(spec):
+    """
+    Compile a criteria set (see the module docstring for its shape) into a CompiledCriteria. Raises ValueError, naming
+    the part of the set at fault, if it isn't well formed.
+    """
+    score_tables = {}
+    scores = {}
+    if not isinstance(spec, dict):
+        raise ValueError("criteria set: must be an object")
+    definitions = spec.get("scores", {})
+    if not isinstance(definitions, dict):
+        raise ValueError("scores: must be an object")
+    for score, definition in definitions.items():
+        if score in _FIELD_VALUES: # Rules look fields up first, so a score with a field's name could never be used
+            raise ValueError(f"scores.{score}: a score can't have the same name as an input field")
+        fields = _require(definition, "fields", f"scores.{score}", list)
+        at_least = _require(definition, "at_least", f"scores.{score}", int)
+        if not fields:
+            raise ValueError(f"scores.{score}: 'fields' must list at least one field")
+        unknown = [str(field) for field in fields if not isinstance(field, str) or field not in _FIELD_VALUES]
+        if unknown:
+            raise ValueError(f"scores.{score}: unknown fields {', '.join(unknown)}")
+        repeated = sorted({field for field in fields if fields.count(field) > 1})
+        if repeated:
+            raise ValueError(f"scores.{score}: fields listed more than once: {', '.join(repeated)}")
+        count = np.sum([_FIELD_VALUES[field] for field in fields], axis=0, dtype=np.int8)
+        score_tables[score] = count
+        scores[score] = count >= at_least
+
+    tiers = _require(spec, "tiers", "criteria set", list)
+    default_tier = _require(spec, "default_tier", "criteria set", str)
+    tier_table = np.zeros(len(_ALL_CODES), dtype=np.int8)
+    tier_names = [default_tier]
+    for i, tier in enumerate(tiers):
+        name = _require(tier, "name", f"tiers[{i}]", str)
+        if "rule" not in tier:
+            raise ValueError(f"tiers[{i}] ({name}): missing 'rule'")
+        tier_table[_evaluate(tier["rule"], scores, f"tiers[{i}] ({name})")] = len(tier_names)
+        tier_names.append(name)
+    return CompiledCriteria(spec.get("name", ""), tuple(tier_names), tier_table, score_tables)
+
+
+def load_criteria(name_or_path):
+    """
+    Compile a built-in criteria set by name (a key of BUILT_IN), or one defined in a JSON file. Errors in a file are
+    raised as ValueError starting with its path.
+    """
+    if name_or_path in BUILT_IN:
+        return compile_criteria(BUILT_IN[name_or_path])
+    with open(name_or_path, encoding="utf-8") as file:
+        spec = json.load(file)
+    try:
+        return compile_criteria(spec)
+    except ValueError as e:
+        raise ValueError(f"{name_or_path}: {e}") from None
+
+
+def _pack_frame(df):
+    missing = [name for name in INPUT_FIELDS if name not in df.columns]
+    if missing:
+        raise ValueError(f"Missing input columns: {', '.join(missing)}")
+    return pack_codes(*(df[name].to_numpy() for name in INPUT_FIELDS))
+
+
+def compare(df, criteria):
+    """
+    Classify a DataFrame of Yes/No answers with several criteria sets side by side. criteria maps a label to a
+    CompiledCriteria. Each row's answers are packed into an input code once and then looked up in every set's table;
+    the result has "<label>_tier" and "<label>_tier_name" columns for each set.
+    """
+    import pandas as pd
+    codes = _pack_frame(df)
+    out = pd.DataFrame(index=df.index)
+    for label, compiled in criteria.items():
+        tier = compiled.classify_codes(codes)
+        out[f"{label}_tier"] = tier
+        out[f"{label}_tier_name"] = pd.Categorical.from_codes(tier, categories=compiled.tier_names)
+    return out
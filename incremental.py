@@ -0,0 +1,133 @@
+"""
+Incremental re-evaluation of SIRS / sepsis status as new observations arrive for each patient.
+
+Instead of re-running the whole classification over an encounter's history for every new vital sign, each patient
+keeps a small state: the latest answer to each of the eight questions, packed into an 8-bit code, and when each
+criterion was last observed as met. An update touches only that patient's state, so it costs O(1), and only
+changes in severity tier (e.g. SIRS -> Severe Sepsis) are reported.
+"""
+from array import array
+
+from classifier import INPUT_FIELDS, OUTCOMES, TIER_NAMES, PatientInputs, is_met, is_missing
+
+_FIELD_BITS = {name: bit for bit, name in enumerate(INPUT_FIELDS)}
+
+
+class Transition:
+    """ A change in a patient's severity tier."""
+    __slots__ = ("patient_id", "time", "previous_tier", "tier", "sirs_criteria_met")
+
+    def __init__(self, patient_id, time, previous_tier, tier, sirs_criteria_met):
+        self.patient_id = patient_id
+        self.time = time
+        self.previous_tier = previous_tier
+        self.tier = tier
+        self.sirs_criteria_met = sirs_criteria_met
+
+    def __repr__(self):
+        return (f"Transition(patient_id={self.patient_id!r}, time={self.time!r}, "
+                f"{TIER_NAMES[self.previous_tier]!r} -> {TIER_NAMES[self.tier]!r})")
+
+
+class _PatientState:
+    __slots__ = ("code", "tier", "met_at")
+
+    def __init__(self):
+        self.code = 0 # Latest answers, one bit per question in INPUT_FIELDS order
+        self.tier = 0
+        self.met_at = array("d", bytes(8 * len(INPUT_FIELDS))) # When each set bit was last observed
+
+
+class IncrementalEvaluator:
+    """
+    Keeps the current SIRS / sepsis status of many patients and updates it one observation at a time.
+
+    lookback is how long (in the same units as the event times, e.g. seconds or hours) a criterion that was observed
+    as met keeps counting without being observed again; None means it counts until a later "No" replaces it.
+    Observations for a given patient are expected to arrive in time order.
+    """
+
+    def __init__(self, lookback=None):
+        self.lookback = lookback
+        self._patients = {}
+
+    def __len__(self):
+        return len(self._patients)
+
+    def __contains__(self, patient_id):
+        return patient_id in self._patients
+
+    def update(self, patient_id, time, **answers):
+        """
+        Record new answers (keyword arguments named after INPUT_FIELDS, "Yes"/"No" or bools) for a patient at the
+        given time. A missing answer (None or NaN, e.g. a vital sign that wasn't measured) leaves the latest answer to
+        that question as it was, until the lookback expires it. Returns a Transition if the patient's tier changed,
+        otherwise None.
+        """
+        # Read every answer before changing anything, so an invalid one leaves the patient's state as it was
+        observed = [(_FIELD_BITS[name], is_met(answer)) for name, answer in answers.items() if not is_missing(answer)]
+        state = self._patients.get(patient_id)
+        if state is None:
+            state = self._patients[patient_id] = _PatientState()
+
+        code = self._expire(state, time)
+        for bit, met in observed:
+            if met:
+                code |= 1 << bit
+                state.met_at[bit] = time
+            else:
+                code &= ~(1 << bit)
+        return self._set_code(patient_id, state, code, time)
+
+    def process(self, events):
+        """ Feed (patient_id, time, answers) events through update() and yield the resulting transitions."""
+        for patient_id, time, answers in events:
+            transition = self.update(patient_id, time, **answers)
+            if transition is not None:
+                yield transition
+
+    def expire(self, now):
+        """
+        Drop criteria that have fallen out of the lookback window for every patient, as of now. Patients whose tier
+        changes as a result are returned as transitions. Only needed for patients that have stopped receiving
+        observations, since update() already does this for the patient it's called for.
+        """
+        if self.lookback is None:
+            return []
+        transitions = []
+        for patient_id, state in self._patients.items():
+            transition = self._set_code(patient_id, state, self._expire(state, now), now)
+            if transition is not None:
+                transitions.append(transition)
+        return transitions
+
+    def current(self, patient_id):
+        """ Return the patient's classifier.Result based on what's been recorded so far."""
+        return OUTCOMES[self._patients[patient_id].code]
+
+    def inputs(self, patient_id):
+        """ Return the patient's latest answers as PatientInputs."""
+        return PatientInputs.from_code(self._patients[patient_id].code)
+
+    def discard(self, patient_id):
+        """ Forget a patient, e.g. once their encounter has ended."""
+        self._patients.pop(patient_id, None)
+
+    def _expire(self, state, now):
+        code = state.code
+        if self.lookback is None or not code:
+            return code
+        cutoff = now - self.lookback
+        met_at = state.met_at
+        for bit in range(len(INPUT_FIELDS)):
+            if code >> bit & 1 and met_at[bit] < cutoff:
+                code &= ~(1 << bit)
+        return code
+
+    def _set_code(self, patient_id, state, code, time):
+        state.code = code
+        outcome = OUTCOMES[code]
+        if outcome.tier == state.tier:
+            return None
+        previous_tier, state.tier = state.tier, outcome.tier
+        return Transition(patient_id, time, previous_tier, outcome.tier, outcome.sirs_criteria_met)
@@ -0,0 +1,227 @@
+"""
+Optional, low-overhead instrumentation for the calculator.
+
+Records timing histograms for each phase of a run (classification, rendering, the whole Streamlit rerun) and counts
+how often each severity tier is reached and each info section is opened. Everything is off unless SIRS_METRICS=1 is
+set (or enable() is called); when off, timer() hands back a shared no-op context manager and the count functions
+return straight away, so instrumented code costs next to nothing.
+
+The numbers can be read as Prometheus text (render_prometheus()), served over HTTP, or dumped to a JSON file
+periodically. configure_from_environment() sets these up from environment variables:
+    SIRS_METRICS=1                 turn instrumentation on
+    SIRS_METRICS_PORT=9108         serve Prometheus text at http://127.0.0.1:9108/metrics
+    SIRS_METRICS_JSON=metrics.json write a JSON snapshot to this file...
+    SIRS_METRICS_INTERVAL=60       ...every this many seconds (default: 60)
+
+The state lives in this module, so it's shared by every Streamlit session in the process and survives reruns.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+
+from classifier import TIER_NAMES
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Info sections that can be counted with count_section()
+SECTIONS = ("when_to_use", "pearls_and_pitfalls", "why_use", "next_steps", "sepsis_information", "creator_insights")
+
+enabled = os.environ.get("SIRS_METRICS", "") not in ("", "0")
+
+_lock = threading.Lock()
+_configured = False
+
+
+class Histogram:
+    __slots__ = ("bucket_counts", "sum", "count")
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(BUCKETS) + 1) # The last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.bucket_counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+_phases = {}
+_tiers = [0] * len(TIER_NAMES)
+_sections = dict.fromkeys(SECTIONS, 0)
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def reset():
+    """ Clear everything recorded so far."""
+    with _lock:
+        _phases.clear()
+        _tiers[:] = [0] * len(TIER_NAMES)
+        for section in _sections:
+            _sections[section] = 0
+
+
+def observe(phase, seconds):
+    """ Record that a phase took the given number of seconds."""
+    if not enabled:
+        return
+    with _lock:
+        histogram = _phases.get(phase)
+        if histogram is None:
+            histogram = _phases[phase] = Histogram()
+        histogram.observe(seconds)
+
+
+class _Timer:
+    __slots__ = ("phase", "start")
+
+    def __init__(self, phase):
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        observe(self.phase, time.perf_counter() - self.start)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(phase):
+    """ Context manager that records how long its block takes as one observation of phase."""
+    return _Timer(phase) if enabled else _NULL_TIMER
+
+
+def count_tier(tier, n=1):
+    """ Count n results in the given severity tier (one of the tier constants in classifier.py)."""
+    if not enabled:
+        return
+    with _lock:
+        _tiers[tier] += n
+
+
+def count_section(section):
+    """ Count one opening of an info section (one of SECTIONS)."""
+    if not enabled:
+        return
+    with _lock:
+        _sections[section] += 1
+
+
+def snapshot():
+    """ Everything recorded so far, as a JSON-friendly dict."""
+    with _lock:
+        return {
+            "timestamp": time.time(),
+            "phases": {phase: {"buckets": dict(zip([str(bound) for bound in BUCKETS] + ["+Inf"],
+                                                   histogram.bucket_counts)),
+                               "sum": histogram.sum, "count": histogram.count}
+                       for phase, histogram in _phases.items()},
+            "tiers": dict(zip(TIER_NAMES, _tiers)),
+            "sections": dict(_sections),
+        }
+
+
+def render_prometheus():
+    """ Everything recorded so far, in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        lines.append("# HELP sirs_phase_seconds Time spent in each phase of a calculator run.")
+        lines.append("# TYPE sirs_phase_seconds histogram")
+        for phase, histogram in _phases.items():
+            cumulative = 0
+            for bound, count in zip([str(bound) for bound in BUCKETS] + ["+Inf"], histogram.bucket_counts):
+                cumulative += count
+                lines.append(f'sirs_phase_seconds_bucket{{phase="{phase}",le="{bound}"}} {cumulative}')
+            lines.append(f'sirs_phase_seconds_sum{{phase="{phase}"}} {histogram.sum}')
+            lines.append(f'sirs_phase_seconds_count{{phase="{phase}"}} {histogram.count}')
+
+        lines.append("# HELP sirs_results_total Results shown or returned, by severity tier.")
+        lines.append("# TYPE sirs_results_total counter")
+        for name, count in zip(TIER_NAMES, _tiers):
+            lines.append(f'sirs_results_total{{tier="{name}"}} {count}')
+
+        lines.append("# HELP sirs_info_sections_total Times each info section was opened.")
+        lines.append("# TYPE sirs_info_sections_total counter")
+        for section, count in _sections.items():
+            lines.append(f'sirs_info_sections_total{{section="{section}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+def dump_json(path):
+    """ Write snapshot() to path, replacing the file in one step so readers never see a partial write."""
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(snapshot(), file, indent=2)
+    os.replace(temporary_path, path)
+
+
+def start_http_server(port, host="127.0.0.1"):
+    """ Serve render_prometheus() at http://host:port/metrics from a background thread."""
+    # http.server pulls in a fair amount of the standard library, so it's only imported if the endpoint is wanted
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass # Don't log every scrape
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="sirs-metrics-http", daemon=True).start()
+    return server
+
+
+def start_json_dumps(path, interval=60):
+    """ Call dump_json(path) every interval seconds from a background thread."""
+    def dump_forever():
+        while True:
+            time.sleep(interval)
+            dump_json(path)
+    threading.Thread(target=dump_forever, name="sirs-metrics-json", daemon=True).start()
+
+
+def configure_from_environment():
+    """ Start the HTTP endpoint and/or JSON dumps requested by the environment. Only does anything the first time."""
+    global _configured
+    with _lock:
+        if _configured or not enabled:
+            return
+        _configured = True
+    if os.environ.get("SIRS_METRICS_PORT"):
+        start_http_server(int(os.environ["SIRS_METRICS_PORT"]))
+    if os.environ.get("SIRS_METRICS_JSON"):
+        start_json_dumps(os.environ["SIRS_METRICS_JSON"], float(os.environ.get("SIRS_METRICS_INTERVAL", 60)))
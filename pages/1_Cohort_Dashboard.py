@@ -0,0 +1,62 @@
+import os
+
+import streamlit as st
+
+from cohort import CohortRollup
+
+DEFAULT_ROLLUP = os.environ.get("SIRS_COHORT_ROLLUP", "cohort_rollup")
+
+
+@st.cache_data
+def load_report(directory, modified, units):
+    """
+    Load a saved roll-up and build the report tables for the chosen units (all of them if units is empty). modified
+    is the roll-up's modification time, so the cache is refreshed whenever cohort.py adds more data to it.
+    """
+    rollup = CohortRollup.load(directory)
+    all_units = sorted(rollup.hourly_tiers.index.get_level_values("unit").unique())
+    selected = list(units) or None
+    hourly = rollup.tier_counts_by_hour(selected).groupby(level="hour").sum()
+    return {
+        "rows": rollup.rows,
+        "units": all_units,
+        "by_unit": rollup.tier_counts_by_unit(selected),
+        "hourly": hourly,
+        "sirs_distribution": rollup.sirs_distribution(selected),
+        "transition_rates": rollup.transition_rates(),
+    }
+
+
+def main():
+    st.title("Cohort Dashboard")
+    st.write("Counts of SIRS, sepsis, severe sepsis, septic shock, and multiple organ dysfunction syndrome across "
+             "scored patients. Build or update the roll-up with `python cohort.py <roll-up directory> <scored files>`.")
+
+    directory = st.text_input("Roll-up directory", DEFAULT_ROLLUP)
+    meta_path = os.path.join(directory, "meta.parquet")
+    if not os.path.exists(meta_path):
+        st.info("No roll-up found in this directory yet.")
+        return
+
+    modified = os.path.getmtime(meta_path)
+    units = st.multiselect("Units", load_report(directory, modified, ())["units"])
+    report = load_report(directory, modified, tuple(units))
+
+    st.write(f"**{report['rows']:,}** scored rows")
+    st.subheader("Results by unit")
+    st.dataframe(report["by_unit"], use_container_width=True)
+
+    st.subheader("Results by hour")
+    st.line_chart(report["hourly"])
+
+    st.subheader("Number of SIRS criteria met")
+    st.bar_chart(report["sirs_distribution"].sum().rename("rows"))
+    st.dataframe(report["sirs_distribution"], use_container_width=True)
+
+    st.subheader("Transition rates between tiers")
+    st.write("Share of consecutive observations of the same patient that went from the tier on the left to the tier "
+             "at the top (all units).")
+    st.dataframe(report["transition_rates"].style.format("{:.1%}"), use_container_width=True)
+
+
+main()
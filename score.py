@@ -0,0 +1,316 @@
+"""
+Command-line bulk scoring of patient rows from CSV or Parquet files.
+
+Rows are read and scored in fixed-size chunks, so memory use stays flat no matter how large the input is. With
+--workers N the chunks are parsed and scored by a pool of N processes and written back out in input order.
+
+Examples:
+    python score.py patients.csv scored.csv
+    python score.py encounters.parquet scored.parquet --vitals --temperature-unit F --keep encounter_id
+    python score.py labs.csv scored.csv --vitals --wbc-unit 10^3/uL
+    python score.py patients.csv -            # write CSV to stdout
+    python score.py cohort.csv scored.parquet --workers 8
+    python score.py cohort.csv compared.csv --criteria sirs_sepsis infection_required local_rules.json
+
+CSV input is read as text, so the input columns are copied to the output exactly as they were written. For Parquet
+output, the types of the copied columns are declared up front (text for CSV input, the stored types for Parquet
+input) rather than inferred from each chunk, so a column that's empty in one chunk and filled in later doesn't
+change type partway through the file. pyarrow is only imported when reading or writing Parquet.
+"""
+import argparse
+import functools
+import io
+import itertools
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from batch import RESULT_COLUMNS, classify_frame
+from classifier import INPUT_FIELDS, SIRS_FIELDS, TIER_NAMES, is_met
+from criteria import compare, load_criteria
+from vitals import WBC_UNITS, classify_vitals_frame
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def _is_parquet(path):
+    return path.lower().endswith((".parquet", ".pq"))
+
+
+def iter_chunks(path, chunksize=DEFAULT_CHUNKSIZE, columns=None, dtype=None):
+    """
+    Yield the rows of a CSV or Parquet file as DataFrames of at most chunksize rows. dtype is passed on to
+    pd.read_csv() (Parquet files already have types).
+    """
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+        for record_batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield record_batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize, usecols=columns, dtype=dtype)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_criteria(name_or_path):
+    return load_criteria(name_or_path)
+
+
+def criteria_label(name_or_path):
+    """ The column prefix for a criteria set given to --criteria: its built-in name or its file name."""
+    return os.path.splitext(os.path.basename(name_or_path))[0]
+
+
+def _check_criteria_labels(criteria):
+    """ Raise ValueError if two criteria sets would get the same label, and so write to the same columns."""
+    labels = {}
+    for name in criteria:
+        label = criteria_label(name)
+        if label in labels:
+            raise ValueError(f"Criteria sets {labels[label]} and {name} would both write {label}_tier columns; "
+                             f"rename one of them")
+        labels[label] = name
+
+
+# Answers written as 0/1 or true/false in a CSV file are read as text (see score_file())
+_ANSWER_TEXT = {"1": True, "0": False, "1.0": True, "0.0": False, "True": True, "False": False, "true": True,
+                "false": False}
+
+
+def _parse_answers(df, fields):
+    """
+    df with the given columns of text answers ("Yes"/"No", or 0/1 or true/false from a CSV file) turned into
+    booleans, as classifier.is_met() reads them. Each distinct answer in a column is only looked at once.
+    """
+    parsed = {}
+    for name in fields:
+        if name in df.columns and df[name].dtype == object:
+            codes, answers = pd.factorize(df[name].to_numpy()) # Missing answers get code -1
+            met = np.array([is_met(_ANSWER_TEXT.get(answer, answer)) for answer in answers] + [False])
+            parsed[name] = met[codes]
+    return df.assign(**parsed) if parsed else df
+
+
+def score_chunk(df, vitals=False, temperature_unit="C", wbc_unit="cells/mm3", keep=None, criteria=()):
+    """
+    Score one chunk of rows, with batch.classify_frame() or, when vitals is True, vitals.classify_vitals_frame()
+    (with the given temperature and WBC units).
+    Returns the kept input columns (all of them if keep is None) followed by RESULT_COLUMNS, and then the tier
+    columns from criteria.compare() for each criteria set (a built-in name or JSON file) in criteria.
+    """
+    # In vitals mode the SIRS columns hold raw measurements, which vitals.py reads as numbers itself
+    parsed = _parse_answers(df, INPUT_FIELDS[len(SIRS_FIELDS):] if vitals else INPUT_FIELDS)
+    if vitals:
+        results = classify_vitals_frame(parsed, temperature_unit, wbc_unit)
+        answers = results[list(SIRS_FIELDS)].join(parsed[list(INPUT_FIELDS[len(SIRS_FIELDS):])])
+    else:
+        results = classify_frame(parsed)
+        answers = parsed
+    results = results[list(RESULT_COLUMNS)]
+    if criteria:
+        results = results.join(compare(answers, {criteria_label(name): _load_criteria(name) for name in criteria}))
+    kept = df if keep is None else df[list(keep)]
+    return kept.drop(columns=[name for name in results.columns if name in kept.columns]).join(results)
+
+
+class _CsvSink:
+    def __init__(self, path):
+        self.file = sys.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+        self.header = True
+
+    def write(self, scored):
+        if isinstance(scored, str):
+            # Already formatted by a worker process, with a header line of its own
+            self.file.write(scored if self.header else scored.split("\n", 1)[1])
+        else:
+            scored.to_csv(self.file, header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+def _kept_types(input_path, criteria):
+    """
+    The Arrow type of each input column that may be copied to a Parquet output: the stored type for a Parquet input,
+    or text for a CSV input. Columns that score_chunk() replaces with results are left out.
+    """
+    import pyarrow as pa
+    if _is_parquet(input_path):
+        import pyarrow.parquet as pq
+        types = {field.name: field.type for field in pq.ParquetFile(input_path).schema_arrow}
+    else:
+        types = dict.fromkeys(pd.read_csv(input_path, nrows=0).columns, pa.string())
+    for name in RESULT_COLUMNS + tuple(f"{criteria_label(name)}_{suffix}" for name in criteria
+                                       for suffix in ("tier", "tier_name")):
+        types.pop(name, None)
+    return types
+
+
+def _to_table(scored, kept_types):
+    """
+    Convert a scored chunk to a pyarrow Table, giving the kept input columns their types from _kept_types() instead of
+    ones inferred from this chunk, so every chunk has the same schema.
+    """
+    import pyarrow as pa
+    schema = pa.Schema.from_pandas(scored, preserve_index=False)
+    for i, name in enumerate(schema.names):
+        if name in kept_types:
+            schema = schema.set(i, schema.field(i).with_type(kept_types[name]))
+    return pa.Table.from_pandas(scored, schema=schema, preserve_index=False)
+
+
+class _ParquetSink:
+    def __init__(self, path, kept_types):
+        self.path = path
+        self.kept_types = kept_types
+        self.writer = None
+
+    def write(self, scored):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = scored if isinstance(scored, pa.Table) else _to_table(scored, self.kept_types)
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def _tier_counts(scored):
+    return np.bincount(scored["tier"].to_numpy(), minlength=len(TIER_NAMES))
+
+
+def _iter_csv_blocks(path, chunksize):
+    """ Split a CSV file into (header, block of up to chunksize raw lines) without parsing it."""
+    with open(path, "rb") as file:
+        header = file.readline()
+        while True:
+            block = b"".join(itertools.islice(file, chunksize))
+            if not block:
+                return
+            yield header, block
+
+
+def _score_task(payload, vitals, temperature_unit, wbc_unit, keep, criteria, kept_types):
+    """
+    Worker-process side of score_file(): parse and score one chunk, returning it ready to write along with its
+    per-tier counts. payload is a (header, raw CSV lines) pair or a pyarrow RecordBatch. The chunk is returned as a
+    pyarrow Table (see _to_table()) if kept_types is given, or as CSV text otherwise.
+    """
+    if isinstance(payload, tuple):
+        chunk = pd.read_csv(io.BytesIO(b"".join(payload)), dtype=object)
+    else:
+        chunk = payload.to_pandas()
+    scored = score_chunk(chunk, vitals, temperature_unit, wbc_unit, keep, criteria)
+    if kept_types is not None:
+        return _to_table(scored, kept_types), _tier_counts(scored)
+    return scored.to_csv(index=False), _tier_counts(scored)
+
+
+def _score_parallel(input_path, chunksize, workers, vitals, temperature_unit, wbc_unit, keep, criteria, kept_types):
+    """
+    Hand the chunks of input_path to a pool of worker processes and yield (scored, tier_counts) in input order.
+    Only a few chunks per worker are in flight at once, so memory use stays bounded. CSV chunks are split on raw
+    lines, so quoted fields must not contain line breaks.
+    """
+    if _is_parquet(input_path):
+        import pyarrow.parquet as pq
+        payloads = pq.ParquetFile(input_path).iter_batches(batch_size=chunksize)
+    else:
+        payloads = _iter_csv_blocks(input_path, chunksize)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for payload in payloads:
+            pending.append(executor.submit(_score_task, payload, vitals, temperature_unit, wbc_unit, keep, criteria,
+                                           kept_types))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def score_file(input_path, output_path, chunksize=DEFAULT_CHUNKSIZE, vitals=False, temperature_unit="C",
+               wbc_unit="cells/mm3", keep=None, workers=1, criteria=()):
+    """
+    Stream input_path through score_chunk() into output_path, using a pool of worker processes if workers > 1.
+    Returns the number of rows scored and an array with the number of rows in each tier.
+    """
+    _check_criteria_labels(criteria)
+    if _is_parquet(output_path):
+        kept_types = _kept_types(input_path, criteria)
+        sink = _ParquetSink(output_path, kept_types)
+    else:
+        kept_types = None
+        sink = _CsvSink(output_path)
+    tier_counts = np.zeros(len(TIER_NAMES), dtype=np.int64)
+    if workers > 1:
+        results = _score_parallel(input_path, chunksize, workers, vitals, temperature_unit, wbc_unit, keep, criteria,
+                                  kept_types)
+    else:
+        results = ((scored, _tier_counts(scored)) for scored in
+                   (score_chunk(chunk, vitals, temperature_unit, wbc_unit, keep, criteria)
+                    for chunk in iter_chunks(input_path, chunksize, dtype=object)))
+    try:
+        for scored, counts in results:
+            sink.write(scored)
+            tier_counts += counts
+    finally:
+        sink.close()
+    return int(tier_counts.sum()), tier_counts
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Score patients from a CSV or Parquet file with the SIRS, sepsis, "
+                                                 "and septic shock criteria.")
+    parser.add_argument("input", help="CSV or Parquet file with one row per patient")
+    parser.add_argument("output", help='CSV or Parquet file to write (".parquet" for Parquet, "-" for CSV on stdout)')
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE,
+                        help=f"rows to score at a time (default: {DEFAULT_CHUNKSIZE})")
+    parser.add_argument("--vitals", action="store_true",
+                        help="derive the SIRS criteria from raw temperature, heart_rate, respiratory_rate, paco2, "
+                             "wbc, and bands columns instead of Yes/No answers")
+    parser.add_argument("--temperature-unit", choices=("C", "F"), default="C",
+                        help="unit of the temperature column in --vitals mode (default: C)")
+    parser.add_argument("--wbc-unit", choices=tuple(WBC_UNITS), default="cells/mm3",
+                        help="unit of the wbc column in --vitals mode (default: cells/mm3)")
+    parser.add_argument("--keep", nargs="+", metavar="COLUMN",
+                        help="input columns to copy to the output (default: all of them)")
+    parser.add_argument("--criteria", nargs="+", default=(), metavar="NAME_OR_JSON",
+                        help="also classify with these criteria sets, side by side: built-in names (sirs_sepsis, "
+                             "infection_required) or JSON files (see criteria.py)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help=f"worker processes to score with; 0 means one per CPU (default: 1, this machine has "
+                             f"{os.cpu_count()})")
+    args = parser.parse_args(argv)
+    if args.workers < 0:
+        parser.error("--workers must be 0 or more")
+    try:
+        _check_criteria_labels(args.criteria)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workers = args.workers or os.cpu_count()
+    start = time.perf_counter()
+    rows, tier_counts = score_file(args.input, args.output, args.chunksize, args.vitals, args.temperature_unit,
+                                   args.wbc_unit, args.keep, workers, tuple(args.criteria))
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed if elapsed > 0 else float("inf")
+    print(f"Scored {rows:,} rows in {elapsed:.2f} s ({rate:,.0f} rows/sec)", file=sys.stderr)
+    for name, count in zip(TIER_NAMES, tier_counts.tolist()):
+        print(f"  {name}: {count:,}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from batch import as_bool, classify_frame, pack_codes
+from classifier import INPUT_FIELDS, NO_SIRS, SEPSIS
+
+
+def test_as_bool_yes_no_strings():
+    assert as_bool(np.array(["Yes", "No", "Yes"])).tolist() == [True, False, True]
+    assert as_bool(pd.Series(["Yes", "No"], dtype=object).to_numpy()).tolist() == [True, False]
+
+
+def test_as_bool_numbers():
+    assert as_bool(np.array([1, 0, 2])).tolist() == [True, False, True]
+    assert as_bool(np.array([1.0, 0.0])).tolist() == [True, False]
+
+
+def test_as_bool_nan_is_not_met():
+    assert as_bool(np.array([1.0, np.nan, 0.0])).tolist() == [True, False, False]
+
+
+def test_as_bool_missing_strings_are_not_met():
+    assert as_bool(np.array(["Yes", np.nan, None, "No"], dtype=object)).tolist() == [True, False, False, False]
+    assert as_bool(pd.Series(["Yes", None, "No"], dtype="string").to_numpy()).tolist() == [True, False, False]
+
+
+def test_as_bool_object_bools():
+    values = np.array([True, False, None, np.nan, np.True_], dtype=object)
+    assert as_bool(values).tolist() == [True, False, False, False, True]
+
+
+def test_as_bool_nullable_booleans():
+    values = pd.Series([True, pd.NA, False], dtype="boolean").to_numpy()
+    assert as_bool(values).tolist() == [True, False, False]
+
+
+def test_as_bool_rejects_other_strings():
+    with pytest.raises(ValueError, match="maybe"):
+        as_bool(np.array(["Yes", "maybe"]))
+    with pytest.raises(ValueError, match="yes"):
+        as_bool(np.array(["No", "yes", None], dtype=object))
+
+
+def test_classify_frame_blank_csv_row_meets_nothing():
+    csv = ",".join(INPUT_FIELDS) + "\n1,1,0,0,1,0,0,0\n,,,,,,,\n"
+    result = classify_frame(pd.read_csv(io.StringIO(csv)))
+    assert result["sirs_criteria_met"].tolist() == [2, 0]
+    assert result["tier"].tolist() == [SEPSIS, NO_SIRS]
+
+
+def test_pack_codes_missing_answers():
+    columns = [pd.Series([True, pd.NA], dtype="boolean").to_numpy()] + [np.array([np.nan, 1.0])] * 7
+    assert pack_codes(*columns).tolist() == [0b00000001, 0b11111110]
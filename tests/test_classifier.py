@@ -0,0 +1,112 @@
+import itertools
+
+import pandas as pd
+import pytest
+
+from batch import outcome_table
+from classifier import INPUT_FIELDS, OUTCOMES, PatientInputs, classify, classify_code
+
+OUTCOME_TABLE = "outcome_table.csv"
+
+
+class _Banners:
+    """ Stands in for streamlit, recording the banners shown."""
+
+    def __init__(self):
+        self.shown = []
+
+    def info(self, message):
+        self.shown.append(("info", message))
+
+    def warning(self, message):
+        self.shown.append(("warning", message))
+
+    def error(self, message):
+        self.shown.append(("error", message))
+
+
+def _baseline_banners(temperature, heart_rate, respiratory_rate, white_blood_cells, sepsis, severe_sepsis,
+                      septic_shock, multi_organ_failure):
+    """ The result banners shown by main() before the classifier was split out of it, copied as it was."""
+    st = _Banners()
+
+    # Check SIRS criteria
+    sirs_criteria_met = 0
+    if temperature == "Yes":
+        sirs_criteria_met += 1
+    if heart_rate == "Yes":
+        sirs_criteria_met += 1
+    if respiratory_rate == "Yes":
+        sirs_criteria_met += 1
+    if white_blood_cells == "Yes":
+        sirs_criteria_met += 1
+    has_sirs = sirs_criteria_met >= 2 # If patient meets >= 2 of the criteria, he/she has SIRS
+
+    # Check sepsis, severe sepsis, septic shock, and multi-organ dysfunction criteria
+    has_sepsis = has_sirs and sepsis == "Yes"
+    has_severe_sepsis = has_sirs and severe_sepsis == "Yes"
+    has_septic_shock = has_sirs and septic_shock == "Yes"
+    has_multi_organ_dysfunction_syndrome = has_sirs and multi_organ_failure == "Yes"
+
+    # Display result to screen
+    if not has_sirs:
+        st.info("This patient does not meet SIRS criteria. For other causes of shock, see the Next Steps section.")
+    if has_multi_organ_dysfunction_syndrome:
+        if has_sepsis:
+            st.error("**This patient meets multiple organ dysfunction syndrome criteria. Follow your guidelines for sepsis, \
+                    which typically include aggresive fluid resuscitation, early, broad-spectrum antibiotics, ICU consultation,\
+                    CVP evaluation, and occasionally pressors and transfusion.**")
+        else:
+            st.error("**This patient meets multiple organ dysfunction syndrome criteria.**")
+    elif has_septic_shock:
+        if has_sepsis:
+            st.error("**This patient meets septic shock criteria. Follow your guidelines for sepsis, which typically include\
+                    aggressive fluid resuscitation, early, broad-spectrum antibiotics, ICU consultation, CVP evaluation,\
+                    and occasionally pressors and transfusion.**")
+        else:
+            st.error("**This patient meets septic shock criteria.**")
+    elif has_severe_sepsis:
+        if has_sepsis:
+            st.warning("**This patient meets severe sepsis criteria. Follow your guidelines for sepsis, which typically include\
+                    aggressive fluid resuscitation, early, broad-spectrum antibiotics, ICU consultation, CVP evaluation, and\
+                    occasionally pressors and transfusion.**")
+        else:
+            st.warning("**This patient meets severe sepsis criteria.**")
+    elif has_sepsis:
+        st.warning("**This patient meets sepsis criteria. Follow your guidelines for sepsis, which typically include aggressive\
+                fluid resuscitation, early, broad-spectrum antibiotics, ICU consultation, CVP evaluation, and occasionally\
+                pressors and transfusion.**")
+    elif has_sirs:
+        st.info("**This patient meets SIRS criteria.**")
+    return st.shown
+
+
+@pytest.mark.parametrize("code", range(len(OUTCOMES)))
+def test_matches_baseline_main(code):
+    answers = ["Yes" if code >> bit & 1 else "No" for bit in range(len(INPUT_FIELDS))]
+    result = classify(PatientInputs.from_answers(**dict(zip(INPUT_FIELDS, answers))))
+    assert [(result.banner, result.message)] == _baseline_banners(*answers)
+    assert result == classify_code(code)
+
+
+def test_outcome_table_is_unchanged(request):
+    """
+    Pins every outcome. If the criteria or banners change on purpose, regenerate the table with
+    batch.outcome_table().to_csv("tests/outcome_table.csv") and review the diff.
+    """
+    expected = pd.read_csv(request.path.parent / OUTCOME_TABLE, index_col="code", keep_default_na=False)
+    actual = outcome_table()
+    pd.testing.assert_frame_equal(actual.astype(str), expected.astype(str))
+
+
+def test_results_are_immutable():
+    result = classify(PatientInputs(temperature=True, heart_rate=True))
+    with pytest.raises(AttributeError):
+        result.message = "Changed"
+    assert classify(PatientInputs(temperature=True, heart_rate=True)).message == "**This patient meets SIRS criteria.**"
+
+
+def test_codes_round_trip():
+    for answers in itertools.product((False, True), repeat=len(INPUT_FIELDS)):
+        inputs = PatientInputs(*answers)
+        assert PatientInputs.from_code(inputs.to_code()).to_code() == inputs.to_code()
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from classifier import TIER_NAMES
+from cohort import CohortRollup
+
+
+@pytest.fixture
+def scored():
+    rng = np.random.default_rng(0)
+    n = 2000
+    return pd.DataFrame({
+        "encounter_id": rng.integers(0, 50, n),
+        "unit": rng.choice(["ICU", "ED", "Ward"], n),
+        "time": pd.Timestamp("2024-01-01") + pd.to_timedelta(np.sort(rng.integers(0, 72 * 3600, n)), unit="s"),
+        "tier": rng.integers(0, len(TIER_NAMES), n),
+        "sirs_criteria_met": rng.integers(0, 5, n),
+    })
+
+
+def _assert_same(actual, expected):
+    pd.testing.assert_series_equal(actual.hourly_tiers.sort_index(), expected.hourly_tiers.sort_index(),
+                                   check_names=False)
+    pd.testing.assert_series_equal(actual.sirs_counts.sort_index(), expected.sirs_counts.sort_index(),
+                                   check_names=False)
+    np.testing.assert_array_equal(actual.transitions, expected.transitions)
+    pd.testing.assert_frame_equal(actual.latest.sort_index(), expected.latest.sort_index(), check_names=False)
+    assert actual.rows == expected.rows
+
+
+def test_update_in_two_steps_matches_one(scored):
+    whole = CohortRollup().update(scored)
+    half = len(scored) // 2
+    in_two = CohortRollup().update(scored.iloc[:half]).update(scored.iloc[half:])
+    _assert_same(in_two, whole)
+    assert whole.rows == len(scored)
+    # Every row but each patient's first is paired with the one before it
+    assert whole.transitions.sum() == len(scored) - scored["encounter_id"].nunique()
+
+
+def test_save_and_load_round_trip(scored, tmp_path):
+    rollup = CohortRollup().update(scored)
+    rollup.save(tmp_path / "rollup")
+    loaded = CohortRollup.load(tmp_path / "rollup")
+    _assert_same(loaded, rollup)
+    pd.testing.assert_frame_equal(loaded.tier_counts_by_unit(), rollup.tier_counts_by_unit())
+    pd.testing.assert_frame_equal(loaded.transition_rates(), rollup.transition_rates())
+
+
+def test_loaded_rollup_keeps_adding(scored, tmp_path):
+    half = len(scored) // 2
+    CohortRollup().update(scored.iloc[:half]).save(tmp_path / "rollup")
+    resumed = CohortRollup.load(tmp_path / "rollup").update(scored.iloc[half:])
+    _assert_same(resumed, CohortRollup().update(scored))
+
+
+def test_patient_ids_match_across_input_types(scored, tmp_path):
+    half = len(scored) // 2
+    as_text = scored.iloc[half:].assign(encounter_id=scored["encounter_id"].iloc[half:].astype(str))
+    rollup = CohortRollup().update(scored.iloc[:half]).update(as_text)
+    _assert_same(rollup, CohortRollup().update(scored))
+    rollup.save(tmp_path / "rollup")
+    _assert_same(CohortRollup.load(tmp_path / "rollup"), rollup)
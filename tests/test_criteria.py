@@ -0,0 +1,58 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from batch import SIRS_CRITERIA_MET_BY_CODE, TIER_BY_CODE
+from classifier import INPUT_FIELDS, TIER_NAMES
+from criteria import SIRS_SEPSIS, compare, compile_criteria, load_criteria
+
+
+def test_sirs_sepsis_matches_classifier():
+    compiled = load_criteria("sirs_sepsis")
+    np.testing.assert_array_equal(compiled.tier_table, TIER_BY_CODE)
+    np.testing.assert_array_equal(compiled.score_tables["sirs"], SIRS_CRITERIA_MET_BY_CODE)
+    assert compiled.tier_names == TIER_NAMES
+
+
+def test_infection_required_only_changes_tiers_without_sepsis():
+    default, strict = load_criteria("sirs_sepsis"), load_criteria("infection_required")
+    sepsis = (np.arange(len(TIER_BY_CODE)) >> INPUT_FIELDS.index("sepsis") & 1).astype(bool)
+    np.testing.assert_array_equal(strict.tier_table[sepsis], default.tier_table[sepsis])
+    assert (strict.tier_table[~sepsis] <= 1).all()
+
+
+def test_compare():
+    df = pd.DataFrame([["Yes", "Yes", "No", "No", "No", "Yes", "No", "No"]], columns=INPUT_FIELDS)
+    result = compare(df, {"default": load_criteria("sirs_sepsis"), "strict": load_criteria("infection_required")})
+    assert result.loc[0, "default_tier_name"] == "Severe Sepsis"
+    assert result.loc[0, "strict_tier_name"] == "SIRS"
+
+
+@pytest.mark.parametrize("change, message", [
+    (lambda spec: spec["scores"]["sirs"].pop("at_least"), "scores.sirs: missing 'at_least'"),
+    (lambda spec: spec["scores"]["sirs"].pop("fields"), "scores.sirs: missing 'fields'"),
+    (lambda spec: spec.pop("tiers"), "criteria set: missing 'tiers'"),
+    (lambda spec: spec.pop("default_tier"), "criteria set: missing 'default_tier'"),
+    (lambda spec: spec["tiers"][1].pop("rule"), r"tiers\[1\] \(Sepsis\): missing 'rule'"),
+    (lambda spec: spec["tiers"][1].pop("name"), r"tiers\[1\]: missing 'name'"),
+    (lambda spec: spec["tiers"][1].update(rule="sirs_met"), "unknown field or score 'sirs_met'"),
+    (lambda spec: spec["scores"]["sirs"].update(fields=[]), "scores.sirs: 'fields' must list at least one field"),
+    (lambda spec: spec["scores"]["sirs"]["fields"].append("temperature"),
+     "scores.sirs: fields listed more than once: temperature"),
+    (lambda spec: spec["scores"].update(sepsis={"fields": ["sepsis"], "at_least": 1}),
+     "scores.sepsis: a score can't have the same name as an input field"),
+])
+def test_malformed_criteria_sets(change, message):
+    spec = json.loads(json.dumps(SIRS_SEPSIS))
+    change(spec)
+    with pytest.raises(ValueError, match=message):
+        compile_criteria(spec)
+
+
+def test_load_criteria_names_the_file(tmp_path):
+    path = tmp_path / "local.json"
+    path.write_text(json.dumps({"tiers": []}))
+    with pytest.raises(ValueError, match="local.json: criteria set: missing 'default_tier'"):
+        load_criteria(str(path))
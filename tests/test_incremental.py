@@ -0,0 +1,52 @@
+import pytest
+
+from classifier import NO_SIRS, SEPSIS, SIRS
+from incremental import IncrementalEvaluator
+
+
+def test_transitions():
+    evaluator = IncrementalEvaluator()
+    assert evaluator.update("a", 0, temperature="Yes") is None
+    transition = evaluator.update("a", 1, heart_rate=True)
+    assert (transition.previous_tier, transition.tier) == (NO_SIRS, SIRS)
+    assert evaluator.update("a", 2, sepsis="Yes").tier == SEPSIS
+    assert evaluator.update("a", 3, heart_rate="No").tier == NO_SIRS
+
+
+@pytest.mark.parametrize("missing", [None, float("nan")])
+def test_missing_observations_are_not_met(missing):
+    evaluator = IncrementalEvaluator(lookback=10)
+    assert evaluator.update("a", 0, temperature=missing, heart_rate="Yes") is None
+    assert not evaluator.inputs("a").temperature
+    assert evaluator.current("a").sirs_criteria_met == 1
+
+
+def test_missing_observation_keeps_earlier_answer():
+    evaluator = IncrementalEvaluator(lookback=10)
+    evaluator.update("a", 0, temperature="Yes", heart_rate="Yes")
+    assert evaluator.update("a", 5, temperature=float("nan"), heart_rate=None) is None
+    assert evaluator.current("a").tier == SIRS
+    # Still expires as of when it was last observed as met, not when the missing value came in
+    assert evaluator.update("a", 11, temperature=float("nan")).tier == NO_SIRS
+
+
+def test_lookback_expires_criteria():
+    evaluator = IncrementalEvaluator(lookback=10)
+    evaluator.update("a", 0, temperature="Yes", heart_rate="Yes")
+    assert evaluator.current("a").tier == SIRS
+    transitions = evaluator.expire(11)
+    assert [(t.patient_id, t.tier) for t in transitions] == [("a", NO_SIRS)]
+
+
+def test_rejects_unknown_answers_without_changing_state():
+    evaluator = IncrementalEvaluator(lookback=10)
+    with pytest.raises(ValueError):
+        evaluator.update("a", 0, temperature="Yes", heart_rate="maybe")
+    assert "a" not in evaluator
+
+    evaluator.update("b", 0, temperature="Yes", heart_rate="Yes")
+    with pytest.raises(ValueError):
+        evaluator.update("b", 8, temperature="Yes", heart_rate="maybe")
+    assert evaluator.current("b").tier == SIRS
+    # temperature's met_at wasn't moved to 8 by the failed update, so it expires on time
+    assert evaluator.update("b", 11).tier == NO_SIRS
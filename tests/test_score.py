@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from classifier import INPUT_FIELDS, MODS, NO_SIRS, SEPSIS
+from score import parse_args, score_file
+
+
+def _write_csv(path, rows, extra=None):
+    df = pd.DataFrame(rows, columns=INPUT_FIELDS)
+    for name, values in (extra or {}).items():
+        df.insert(0, name, values)
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_csv_answers_as_0_1_with_blanks(tmp_path):
+    input_path = tmp_path / "input.csv"
+    input_path.write_text(",".join(INPUT_FIELDS) + "\n1,1,0,0,1,0,0,0\n,,,,,,,\n1,1,1,1,1,1,1,1\n")
+    rows, tier_counts = score_file(str(input_path), str(tmp_path / "output.csv"))
+    scored = pd.read_csv(tmp_path / "output.csv")
+    assert rows == 3
+    assert scored["tier"].tolist() == [SEPSIS, NO_SIRS, MODS]
+    assert tier_counts.sum() == 3
+
+
+def test_csv_rejects_unknown_answers(tmp_path):
+    input_path = _write_csv(tmp_path / "input.csv", [["Yes", "Yes", "No", "No", "maybe", "No", "No", "No"]])
+    with pytest.raises(ValueError, match="maybe"):
+        score_file(str(input_path), str(tmp_path / "output.csv"))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parquet_output_with_column_filled_in_later_chunk(tmp_path, workers):
+    # "note" is blank for the whole first chunk, so inferring its type from that chunk alone would make it numeric
+    n = 1200
+    note = np.full(n, None, dtype=object)
+    note[700:] = "abc"
+    answers = np.where(np.arange(n)[:, None] % 3 == 0, "Yes", "No").repeat(len(INPUT_FIELDS), axis=1)
+    input_path = _write_csv(tmp_path / "drift.csv", answers, {"note": note})
+    output_path = tmp_path / "drift.parquet"
+    rows, _ = score_file(str(input_path), str(output_path), chunksize=500, workers=workers)
+    scored = pd.read_parquet(output_path)
+    assert rows == n
+    assert scored["note"].isna().sum() == 700
+    assert (scored["note"].iloc[700:] == "abc").all()
+    assert scored["tier"].tolist() == np.where(np.arange(n) % 3 == 0, MODS, NO_SIRS).tolist()
+
+
+def test_parquet_to_parquet_keeps_input_types(tmp_path):
+    n = 1000
+    df = pd.DataFrame({name: np.arange(n) % 2 for name in INPUT_FIELDS})
+    ids = pd.array(np.arange(n), dtype="Int64")
+    ids[:600] = pd.NA
+    df.insert(0, "id", ids)
+    df.to_parquet(tmp_path / "input.parquet", index=False)
+    score_file(str(tmp_path / "input.parquet"), str(tmp_path / "output.parquet"), chunksize=300)
+    scored = pd.read_parquet(tmp_path / "output.parquet")
+    assert scored["id"].dtype == "Int64"
+    assert scored["id"].isna().sum() == 600
+
+
+def test_workers_must_not_be_negative(capsys):
+    with pytest.raises(SystemExit):
+        parse_args(["input.csv", "output.csv", "--workers", "-1"])
+    assert "--workers must be 0 or more" in capsys.readouterr().err
+    assert parse_args(["input.csv", "output.csv", "--workers", "0"]).workers == 0
+
+
+def test_criteria_labels_must_differ(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        parse_args(["input.csv", "output.csv", "--criteria", "a/local.json", "b/local.json"])
+    assert "local_tier" in capsys.readouterr().err
+    with pytest.raises(ValueError, match="local_tier"):
+        score_file("input.csv", str(tmp_path / "output.csv"), criteria=("a/local.json", "b/local.json"))
+
+
+@pytest.mark.parametrize("output, workers", [("output.csv", 1), ("output.parquet", 1), ("output.csv", 2)])
+def test_csv_vitals(tmp_path, output, workers):
+    input_path = tmp_path / "vitals.csv"
+    input_path.write_text("temperature,heart_rate,respiratory_rate,wbc,sepsis,severe_sepsis,septic_shock,"
+                          "multi_organ_failure\n"
+                          "39.0,95,16,8000,Yes,No,No,0\n"
+                          "37.0,80,16,8000,No,No,No,0\n"
+                          ",,,,,,,\n")
+    rows, _ = score_file(str(input_path), str(tmp_path / output), vitals=True, workers=workers)
+    scored = pd.read_parquet(tmp_path / output) if output.endswith(".parquet") else pd.read_csv(tmp_path / output)
+    assert rows == 3
+    assert scored["sirs_criteria_met"].tolist() == [2, 0, 0]
+    assert scored["tier"].tolist() == [SEPSIS, NO_SIRS, NO_SIRS]
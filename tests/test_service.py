@@ -0,0 +1,31 @@
+import pytest
+import tornado.web
+
+from service import _answers_to_code, parse_json
+
+
+def test_answers_to_code():
+    assert _answers_to_code({"temperature": "Yes", "heart_rate": True, "sepsis": "No", "septic_shock": False}) == 0b11
+    assert _answers_to_code({"multi_organ_failure": "Yes"}) == 0b10000000
+    assert _answers_to_code({}) == 0
+
+
+@pytest.mark.parametrize("answer", ["1", "0", "1.0", "1e0", '"yes"', "null", "NaN", "[]", "{}"])
+def test_answers_to_code_rejects_other_values(answer):
+    with pytest.raises(tornado.web.HTTPError) as error:
+        _answers_to_code(parse_json(f'{{"temperature": {answer}}}'))
+    assert error.value.status_code == 400
+    assert error.value.reason == 'temperature must be "Yes", "No", true, or false'
+
+
+def test_answers_to_code_rejects_unknown_fields():
+    with pytest.raises(tornado.web.HTTPError) as error:
+        _answers_to_code({"temperature": "Yes", "temp": "Yes"})
+    assert error.value.reason == "Unknown field: temp"
+
+
+@pytest.mark.parametrize("answers", [[], "Yes", None])
+def test_answers_to_code_rejects_non_objects(answers):
+    with pytest.raises(tornado.web.HTTPError) as error:
+        _answers_to_code(answers)
+    assert error.value.reason == "Each patient must be a JSON object"
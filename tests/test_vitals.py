@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from classifier import INPUT_FIELDS, SIRS_FIELDS
+from vitals import classify_vitals_frame, temperature_criterion, white_blood_cell_criterion
+
+
+def test_temperature_units():
+    assert temperature_criterion([38.5, 37.0, 35.5]).tolist() == [True, False, True]
+    assert temperature_criterion([101.3, 98.6, 95.0], unit="F").tolist() == [True, False, True]
+
+
+def test_white_blood_cell_units():
+    assert white_blood_cell_criterion([13000.0, 8000.0, 3000.0]).tolist() == [True, False, True]
+    assert white_blood_cell_criterion([13.0, 8.0, 3.0], unit="10^3/uL").tolist() == [True, False, True]
+    assert white_blood_cell_criterion([13.0, 8.0, 3.0], unit="10^9/L").tolist() == [True, False, True]
+    with pytest.raises(ValueError):
+        white_blood_cell_criterion([8.0], unit="g/dL")
+
+
+def test_white_blood_cell_bands():
+    assert white_blood_cell_criterion([8000.0, 8000.0], bands=[12.0, 5.0]).tolist() == [True, False]
+
+
+def test_missing_measurements_never_meet_a_criterion():
+    assert temperature_criterion([np.nan]).tolist() == [False]
+    assert white_blood_cell_criterion([np.nan], bands=[np.nan]).tolist() == [False]
+
+
+def test_classify_vitals_frame_wbc_unit():
+    df = pd.DataFrame({"temperature": [38.5, 37.0], "heart_rate": [80.0, 80.0], "respiratory_rate": [16.0, 16.0],
+                       "wbc": [13.0, 8.0]})
+    for name in INPUT_FIELDS[len(SIRS_FIELDS):]:
+        df[name] = "No"
+    result = classify_vitals_frame(df, wbc_unit="10^3/uL")
+    assert result["white_blood_cells"].tolist() == [True, False]
+    assert result["sirs_criteria_met"].tolist() == [2, 0]
+
+
+def _vitals_frame(**columns):
+    df = pd.DataFrame(columns)
+    for name in INPUT_FIELDS[len(SIRS_FIELDS):]:
+        df[name] = "No"
+    return df
+
+
+def test_classify_vitals_frame_blank_values_are_missing():
+    df = _vitals_frame(temperature=["39.0", None], heart_rate=["95", None], respiratory_rate=["16", None],
+                       wbc=["8000", None])
+    assert classify_vitals_frame(df)["sirs_criteria_met"].tolist() == [2, 0]
+
+
+@pytest.mark.parametrize("value", ["n/a", "38,5", "abc"])
+def test_classify_vitals_frame_rejects_malformed_values(value):
+    df = _vitals_frame(temperature=[value, "37.0"], heart_rate=[80.0, 80.0], respiratory_rate=[16.0, 16.0],
+                       wbc=[8000.0, 8000.0])
+    with pytest.raises(ValueError, match=f"temperature: can't read 1 values as numbers, e.g. '{value}'"):
+        classify_vitals_frame(df)
@@ -0,0 +1,123 @@
+"""
+Derive the four SIRS criteria from raw vitals and labs instead of pre-thresholded Yes/No answers.
+
+The thresholds are the ones asked about in main():
+- Temp >38°C (100.4°F) or <36°C (96.8°F)
+- Heart rate >90 bpm
+- Respiratory rate >20 or PaCO₂ <32 mm Hg
+- WBC >12,000/mm³, <4,000/mm³, or >10% bands (WBC counts can be given in cells/mm³ or in 10³/µL, see WBC_UNITS)
+
+Everything works on whole arrays at once. Missing values (NaN or None) never meet a criterion, the same as
+leaving the question on "No" in the calculator; when one of a pair of measurements is missing (e.g. RR but
+not PaCO₂) the other one still counts. Values that are present but aren't numbers (e.g. "n/a" or "38,5") raise
+ValueError rather than being treated as missing. As in batch.py, pandas is only imported when working with DataFrames.
+"""
+import numpy as np
+
+from batch import as_bool, classify_arrays
+from classifier import INPUT_FIELDS, SIRS_FIELDS, TIER_NAMES
+
+# Numeric columns read by classify_vitals_frame(). paco2 and bands are optional.
+VITALS_COLUMNS = ("temperature", "heart_rate", "respiratory_rate", "paco2", "wbc", "bands")
+
+# Units WBC counts can be given in, and what to multiply by to get cells/mm³. Lab feeds often report 10³/µL, which is
+# the same as 10⁹/L, so a normal count of 8,000/mm³ comes through as 8.0.
+WBC_UNITS = {"cells/mm3": 1.0, "10^3/uL": 1000.0, "10^9/L": 1000.0}
+
+
+def _as_float(values):
+    return np.asarray(values, dtype=float)
+
+
+def _column(df, name):
+    """
+    A numeric column as a float array, with pandas' missing values (pd.NA, None) turned into NaN. Raises ValueError
+    if any value is present but can't be read as a number.
+    """
+    import pandas as pd
+    if name not in df.columns:
+        return None
+    values = pd.to_numeric(df[name], errors="coerce")
+    malformed = values.isna() & df[name].notna()
+    if malformed.any():
+        examples = ", ".join(repr(str(value)) for value in df[name][malformed].unique()[:3])
+        raise ValueError(f"{name}: can't read {int(malformed.sum())} values as numbers, e.g. {examples}")
+    return values.to_numpy(dtype=float, na_value=np.nan)
+
+
+def fahrenheit_to_celsius(temperature):
+    return (_as_float(temperature) - 32.0) * 5.0 / 9.0
+
+
+def temperature_criterion(temperature, unit="C"):
+    """ Temp >38°C or <36°C. unit is "C" or "F"."""
+    if unit == "F":
+        temperature = fahrenheit_to_celsius(temperature)
+    elif unit == "C":
+        temperature = _as_float(temperature)
+    else:
+        raise ValueError(f'Temperature unit must be "C" or "F", got {unit!r}')
+    return (temperature > 38.0) | (temperature < 36.0)
+
+
+def heart_rate_criterion(heart_rate):
+    """ Heart rate >90 bpm."""
+    return _as_float(heart_rate) > 90.0
+
+
+def respiratory_criterion(respiratory_rate, paco2=None):
+    """ Respiratory rate >20 breaths/min or PaCO₂ <32 mm Hg."""
+    met = _as_float(respiratory_rate) > 20.0
+    if paco2 is not None:
+        met |= _as_float(paco2) < 32.0
+    return met
+
+
+def white_blood_cell_criterion(wbc, bands=None, unit="cells/mm3"):
+    """ WBC >12,000/mm³ or <4,000/mm³, or >10% bands (given as a percentage). unit is one of WBC_UNITS."""
+    if unit not in WBC_UNITS:
+        raise ValueError(f"WBC unit must be one of {', '.join(WBC_UNITS)}, got {unit!r}")
+    wbc = _as_float(wbc) * WBC_UNITS[unit]
+    met = (wbc > 12000.0) | (wbc < 4000.0)
+    if bands is not None:
+        met |= _as_float(bands) > 10.0
+    return met
+
+
+def sirs_criteria_from_vitals(temperature, heart_rate, respiratory_rate, wbc, paco2=None, bands=None,
+                              temperature_unit="C", wbc_unit="cells/mm3"):
+    """ Return a dict mapping each of SIRS_FIELDS to a boolean array, ready to pass to batch.classify_arrays()."""
+    return {
+        "temperature": temperature_criterion(temperature, temperature_unit),
+        "heart_rate": heart_rate_criterion(heart_rate),
+        "respiratory_rate": respiratory_criterion(respiratory_rate, paco2),
+        "white_blood_cells": white_blood_cell_criterion(wbc, bands, wbc_unit),
+    }
+
+
+def classify_vitals_frame(df, temperature_unit="C", wbc_unit="cells/mm3"):
+    """
+    Classify every row of a DataFrame of raw measurements. The frame needs the numeric VITALS_COLUMNS (paco2 and
+    bands may be left out) plus Yes/No columns for sepsis, severe_sepsis, septic_shock and multi_organ_failure. The
+    units of the temperature and wbc columns are given by temperature_unit and wbc_unit.
+    Returns a DataFrame with the derived SIRS criteria followed by the same columns as batch.classify_frame().
+    """
+    required = ("temperature", "heart_rate", "respiratory_rate", "wbc") + INPUT_FIELDS[len(SIRS_FIELDS):]
+    missing = [name for name in required if name not in df.columns]
+    if missing:
+        raise ValueError(f"Missing input columns: {', '.join(missing)}")
+    import pandas as pd
+
+    criteria = sirs_criteria_from_vitals(
+        _column(df, "temperature"), _column(df, "heart_rate"), _column(df, "respiratory_rate"), _column(df, "wbc"),
+        paco2=_column(df, "paco2"), bands=_column(df, "bands"),
+        temperature_unit=temperature_unit, wbc_unit=wbc_unit,
+    )
+    flags = [as_bool(df[name].to_numpy()) for name in INPUT_FIELDS[len(SIRS_FIELDS):]]
+    sirs_criteria_met, tier = classify_arrays(*(criteria[name] for name in SIRS_FIELDS), *flags)
+
+    out = pd.DataFrame(criteria, index=df.index)
+    out["sirs_criteria_met"] = sirs_criteria_met
+    out["tier"] = tier
+    out["tier_name"] = pd.Categorical.from_codes(tier, categories=TIER_NAMES)
+    return out